@@ -1,22 +1,109 @@
 import click
+import importlib
+import json
+import os
 
-from prelude_cli.views.auth import auth
-from prelude_cli.views.build import build
-from prelude_cli.views.configure import configure
-from prelude_cli.views.detect import detect
-from prelude_cli.views.generate import generate
-from prelude_cli.views.iam import iam
-from prelude_cli.views.jobs import jobs
-from prelude_cli.views.partner import partner
-from prelude_cli.views.scm import scm
-from prelude_sdk.models.account import Account, Keychain
+
+OUTPUT_FORMATS = ["pretty", "json", "ndjson", "csv"]
+
+
+class LazyGroup(click.Group):
+    """
+    Group whose subcommands are imported on first use. Help text is kept alongside the
+    import path so `--help` and command-name completion never load the view modules.
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or dict()
+
+    def list_commands(self, ctx):
+        return sorted(super().list_commands(ctx) + list(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            module, name = self.lazy_subcommands[cmd_name][0].split(":")
+            self.add_command(getattr(importlib.import_module(module), name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        rows = [
+            (name, help) for name, (_, help) in sorted(self.lazy_subcommands.items())
+        ]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+    def shell_complete(self, ctx, incomplete):
+        results = [
+            click.shell_completion.CompletionItem(name, help=help)
+            for name, (_, help) in sorted(self.lazy_subcommands.items())
+            if name.startswith(incomplete)
+        ]
+        results.extend(click.Command.shell_complete(self, ctx, incomplete))
+        return results
+
+
+PRELUDE_DIR = os.path.join(os.path.expanduser("~"), ".prelude")
+
+
+def cached_profiles(
+    keychain_location: str = os.path.join(PRELUDE_DIR, "keychain.ini"),
+    index_location: str = os.path.join(PRELUDE_DIR, "profiles.json"),
+):
+    """
+    Profile names from the keychain, served from a small index that is rebuilt only
+    when keychain.ini changes. Never creates the keychain or touches tokens.
+    """
+    try:
+        stat = os.stat(keychain_location)
+    except OSError:
+        return []
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    try:
+        with open(index_location, "r") as f:
+            index = json.load(f)
+        if index["stamp"] == stamp:
+            return index["profiles"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    import configparser
+
+    cfg = configparser.ConfigParser()
+    cfg.read(keychain_location)
+    profiles = cfg.sections()
+    try:
+        tmp = f"{index_location}.{os.getpid()}"
+        with open(tmp, "w") as f:
+            json.dump(dict(stamp=stamp, profiles=profiles), f)
+        os.replace(tmp, index_location)
+    except OSError:
+        pass
+    return profiles
 
 
 def complete_profile(ctx, param, incomplete):
-    return [x for x in Keychain().read_keychain() if x.startswith(incomplete)]
+    return [x for x in cached_profiles() if x.startswith(incomplete)]
 
 
-@click.group(invoke_without_command=True)
+@click.group(
+    cls=LazyGroup,
+    invoke_without_command=True,
+    lazy_subcommands=dict(
+        auth=("prelude_cli.views.auth:auth", "Authentication"),
+        build=("prelude_cli.views.build:build", "Custom security tests"),
+        configure=(
+            "prelude_cli.views.configure:configure",
+            "Configure your local keychain",
+        ),
+        detect=("prelude_cli.views.detect:detect", "Continuous security testing"),
+        generate=("prelude_cli.views.generate:generate", "Generate tests"),
+        iam=("prelude_cli.views.iam:iam", "Prelude account management"),
+        jobs=("prelude_cli.views.jobs:jobs", "Jobs system commands"),
+        partner=("prelude_cli.views.partner:partner", "Partner system commands"),
+        scm=("prelude_cli.views.scm:scm", "SCM system commands"),
+    ),
+)
 @click.version_option()
 @click.pass_context
 @click.option(
@@ -31,22 +118,24 @@ def complete_profile(ctx, param, incomplete):
     is_flag=True,
     help="Resolve enum values to their string representation",
 )
-def cli(ctx, profile, resolve_enums):
+@click.option(
+    "--output",
+    default="pretty",
+    help="Output format; json, ndjson and csv stream results as they arrive",
+    show_default=True,
+    type=click.Choice(OUTPUT_FORMATS),
+)
+def cli(ctx, profile, resolve_enums, output):
+    if ctx.resilient_parsing:
+        return
+
+    from prelude_sdk.models.account import Account
+
+    ctx.meta["output"] = output
     ctx.obj = Account.from_keychain(profile=profile, resolve_enums=resolve_enums)
     if ctx.invoked_subcommand is None:
         click.echo(ctx.get_help())
 
 
-cli.add_command(auth)
-cli.add_command(build)
-cli.add_command(configure)
-cli.add_command(detect)
-cli.add_command(generate)
-cli.add_command(iam)
-cli.add_command(jobs)
-cli.add_command(partner)
-cli.add_command(scm)
-
-
 if __name__ == "__main__":
     cli()
@@ -2,7 +2,6 @@ import importlib.resources as pkg_resources
 import json
 import os
 import re
-import time
 from datetime import datetime, timezone
 from pathlib import Path, PurePath
 
@@ -11,6 +10,7 @@ import click
 import prelude_cli.templates as templates
 from prelude_cli.views.shared import Spinner, pretty_print
 from prelude_sdk.controllers.build_controller import BuildController
+from prelude_sdk.controllers.jobs_controller import poll_until
 from prelude_sdk.models.codes import Control, EDRResponse
 
 
@@ -155,10 +155,10 @@ def compile_code_file(controller, path, source_test_id):
             )
             if compile_job_id := data.get("job_id"):
                 spinner.update(spinner.task_ids[-1], description="Compiling")
-                while (
-                    result := controller.get_compile_status(compile_job_id)
-                ) and result["status"] == "RUNNING":
-                    time.sleep(2)
+                result = poll_until(
+                    lambda: controller.get_compile_status(compile_job_id),
+                    lambda result: result["status"] != "RUNNING",
+                )
                 if result["status"] == "FAILED":
                     result["error"] = "Failed to compile"
                 data |= result
@@ -203,10 +203,10 @@ def upload_attachment(controller, path, test):
                 )
                 if data.get("compile_job_id"):
                     spinner.update(spinner.task_ids[-1], description="Compiling")
-                    while (
-                        result := controller.get_compile_status(data["compile_job_id"])
-                    ) and result["status"] == "RUNNING":
-                        time.sleep(2)
+                    result = poll_until(
+                        lambda: controller.get_compile_status(data["compile_job_id"]),
+                        lambda result: result["status"] != "RUNNING",
+                    )
                     if result["status"] == "FAILED":
                         result["error"] = "Failed to compile"
                     data |= result
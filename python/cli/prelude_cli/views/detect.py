@@ -1,4 +1,3 @@
-import asyncio
 import click
 import yaml
 
@@ -9,6 +8,7 @@ from pathlib import Path, PurePath
 from prelude_cli.views.shared import Spinner, pretty_print
 from prelude_sdk.controllers.detect_controller import DetectController
 from prelude_sdk.controllers.iam_controller import IAMAccountController
+from prelude_sdk.models.attachment_cache import AttachmentCache
 from prelude_sdk.models.codes import Control, RunCode
 
 
@@ -166,18 +166,22 @@ def do_threat_hunt(controller, threat_hunt_id):
 
 @detect.command("download")
 @click.argument("test")
+@click.option("--no_cache", is_flag=True, help="skip the local attachment cache")
 @click.pass_obj
 @pretty_print
-def download(controller, test):
+def download(controller, test, no_cache):
     """Download a test to your local environment"""
     Path(test).mkdir(parents=True, exist_ok=True)
+    cache = None if no_cache else AttachmentCache()
     with Spinner(description="Downloading test"):
         attachments = controller.get_test(test_id=test).get("attachments")
 
         for attach in attachments:
-            code = controller.download(test_id=test, filename=attach)
+            code = controller.download(test_id=test, filename=attach, cache=cache)
             with open(PurePath(test, attach), "wb") as f:
                 f.write(code)
+        if cache:
+            cache.save()
 
 
 @detect.command("schedule")
@@ -279,24 +283,28 @@ def endpoints(controller, days):
 
 
 @detect.command("clone")
+@click.option(
+    "-w",
+    "--workers",
+    help="number of concurrent downloads",
+    default=8,
+    show_default=True,
+    type=int,
+)
+@click.option("--no_cache", is_flag=True, help="skip the local attachment cache")
 @click.pass_obj
 @pretty_print
-def clone(controller):
+def clone(controller, workers, no_cache):
     """Download all tests to your local environment"""
-
-    async def fetch(test):
-        Path(test["id"]).mkdir(parents=True, exist_ok=True)
-
-        for attach in controller.get_test(test_id=test["id"]).get("attachments"):
-            code = controller.download(test_id=test["id"], filename=attach)
-            with open(PurePath(test["id"], attach), "wb") as f:
-                f.write(code)
-
-    async def start_cloning():
-        await asyncio.gather(*[fetch(test) for test in controller.list_tests()])
-
-    with Spinner(description="Downloading all tests"):
-        asyncio.run(start_cloning())
+    with Spinner(description="Downloading all tests") as spinner:
+        return controller.clone_tests(
+            cache=None if no_cache else AttachmentCache(),
+            max_workers=workers,
+            progress=lambda completed, total: spinner.update(
+                spinner.task_ids[-1],
+                description=f"Downloading all tests ({completed}/{total} files)",
+            ),
+        )
 
 
 @detect.command("activity")
@@ -326,6 +334,13 @@ def clone(controller):
 @click.option("--finish", help="end date of activity (end of day)")
 @click.option("--os", help="comma-separated list of OS")
 @click.option("--policy", help="comma-separated list of policies")
+@click.option(
+    "--shard",
+    help="split the logs view into per-day or per-hour requests fetched concurrently; results are then sorted oldest first",
+    default="none",
+    show_default=True,
+    type=click.Choice(["day", "hour", "none"]),
+)
 @click.option(
     "--social",
     help="whether to fetch account-specific or social stats. Applicable to the following views: protected",
@@ -346,6 +361,7 @@ def describe_activity(
     finish,
     os,
     policy,
+    shard,
     social,
     start,
     statuses,
@@ -382,8 +398,13 @@ def describe_activity(
     if threats:
         filters["threats"] = threats
 
+    shard = (
+        dict(day=timedelta(days=1), hour=timedelta(hours=1)).get(shard)
+        if view == "logs"
+        else None
+    )
     with Spinner(description="Fetching activity"):
-        return controller.describe_activity(view=view, filters=filters)
+        return controller.describe_activity(view=view, filters=filters, shard=shard)
 
 
 @detect.command("threat-hunt-activity")
@@ -5,6 +5,7 @@ import click
 
 from prelude_cli.views.shared import Spinner, pretty_print
 from prelude_sdk.controllers.generate_controller import GenerateController
+from prelude_sdk.controllers.jobs_controller import poll_until
 from prelude_sdk.models.codes import Control
 
 
@@ -15,6 +16,20 @@ def generate(ctx):
     ctx.obj = GenerateController(account=ctx.obj)
 
 
+def _wait_for_threat_intel(controller: GenerateController, job_id: str, spinner):
+    def done(result):
+        if result["status"] != "RUNNING":
+            return True
+        if result["step"] == "GENERATE":
+            spinner.update(
+                spinner.task_ids[-1],
+                description=f'Generating ({result["completed_tasks"]}/{result["num_tasks"]})',
+            )
+        return False
+
+    return poll_until(lambda: controller.get_threat_intel(job_id), done, max_delay=5)
+
+
 def _process_results(result: dict, output_dir: str, job_id: str) -> dict:
     if result["status"] == "COMPLETE":
         for technique in result["output"]:
@@ -85,14 +100,7 @@ def generate_threat_intel(
     with Spinner("Uploading") as spinner:
         job_id = controller.upload_threat_intel(threat_pdf)["job_id"]
         spinner.update(spinner.task_ids[-1], description="Parsing PDF")
-        while (result := controller.get_threat_intel(job_id)) and result[
-            "status"
-        ] == "RUNNING":
-            if result["step"] == "GENERATE":
-                spinner.update(
-                    spinner.task_ids[-1],
-                    description=f'Generating ({result["completed_tasks"]}/{result["num_tasks"]})',
-                )
+        result = _wait_for_threat_intel(controller, job_id, spinner)
     return _process_results(result, output_dir, job_id)
 
 
@@ -117,12 +125,5 @@ def generate_from_partner_advisory(
             partner=Control[partner], advisory_id=advisory_id
         )["job_id"]
         spinner.update(spinner.task_ids[-1], description="Parsing PDF")
-        while (result := controller.get_threat_intel(job_id)) and result[
-            "status"
-        ] == "RUNNING":
-            if result["step"] == "GENERATE":
-                spinner.update(
-                    spinner.task_ids[-1],
-                    description=f'Generating ({result["completed_tasks"]}/{result["num_tasks"]})',
-                )
+        result = _wait_for_threat_intel(controller, job_id, spinner)
     return _process_results(result, output_dir, job_id)
@@ -1,9 +1,7 @@
 import click
 import json
-import requests
-from time import sleep
 
-from prelude_cli.views.shared import Spinner, pretty_print
+from prelude_cli.views.shared import Spinner, collect, pretty_print
 from prelude_sdk.controllers.export_controller import ExportController
 from prelude_sdk.controllers.jobs_controller import JobsController
 from prelude_sdk.controllers.scm_controller import ScmController
@@ -25,6 +23,12 @@ def scm(ctx):
 
 
 @scm.command("endpoints")
+@click.option(
+    "--all",
+    "all_pages",
+    is_flag=True,
+    help="fetch every page instead of --limit results",
+)
 @click.option(
     "--limit", default=100, help="maximum number of results to return", type=int
 )
@@ -38,10 +42,28 @@ def scm(ctx):
 @click.pass_obj
 @pretty_print
 def endpoints(
-    controller, limit, offset, odata_expand, odata_filter, odata_orderby, odata_select
+    controller,
+    all_pages,
+    limit,
+    offset,
+    odata_expand,
+    odata_filter,
+    odata_orderby,
+    odata_select,
 ):
     """List endpoints with SCM data"""
     with Spinner(description="Fetching endpoints from partner"):
+        if all_pages:
+            return collect(
+                controller.iter_endpoints(
+                    expand=odata_expand,
+                    filter=odata_filter,
+                    orderby=odata_orderby,
+                    select=odata_select,
+                    skip=offset,
+                    workers=4,
+                )
+            )
         return controller.endpoints(
             expand=odata_expand,
             filter=odata_filter,
@@ -53,6 +75,12 @@ def endpoints(
 
 
 @scm.command("inboxes")
+@click.option(
+    "--all",
+    "all_pages",
+    is_flag=True,
+    help="fetch every page instead of --limit results",
+)
 @click.option(
     "--limit", default=100, help="maximum number of results to return", type=int
 )
@@ -66,10 +94,28 @@ def endpoints(
 @click.pass_obj
 @pretty_print
 def inboxes(
-    controller, limit, offset, odata_expand, odata_filter, odata_orderby, odata_select
+    controller,
+    all_pages,
+    limit,
+    offset,
+    odata_expand,
+    odata_filter,
+    odata_orderby,
+    odata_select,
 ):
     """List inboxes with SCM data"""
     with Spinner(description="Fetching inboxes from partner"):
+        if all_pages:
+            return collect(
+                controller.iter_inboxes(
+                    expand=odata_expand,
+                    filter=odata_filter,
+                    orderby=odata_orderby,
+                    select=odata_select,
+                    skip=offset,
+                    workers=4,
+                )
+            )
         return controller.inboxes(
             expand=odata_expand,
             filter=odata_filter,
@@ -81,6 +127,12 @@ def inboxes(
 
 
 @scm.command("network_devices")
+@click.option(
+    "--all",
+    "all_pages",
+    is_flag=True,
+    help="fetch every page instead of --limit results",
+)
 @click.option(
     "--limit", default=100, help="maximum number of results to return", type=int
 )
@@ -94,10 +146,28 @@ def inboxes(
 @click.pass_obj
 @pretty_print
 def network_devices(
-    controller, limit, offset, odata_expand, odata_filter, odata_orderby, odata_select
+    controller,
+    all_pages,
+    limit,
+    offset,
+    odata_expand,
+    odata_filter,
+    odata_orderby,
+    odata_select,
 ):
     """List network devices with SCM data"""
     with Spinner(description="Fetching network devices from partner"):
+        if all_pages:
+            return collect(
+                controller.iter_network_devices(
+                    expand=odata_expand,
+                    filter=odata_filter,
+                    orderby=odata_orderby,
+                    select=odata_select,
+                    skip=offset,
+                    workers=4,
+                )
+            )
         return controller.network_devices(
             expand=odata_expand,
             filter=odata_filter,
@@ -109,6 +179,12 @@ def network_devices(
 
 
 @scm.command("users")
+@click.option(
+    "--all",
+    "all_pages",
+    is_flag=True,
+    help="fetch every page instead of --limit results",
+)
 @click.option(
     "--limit", default=100, help="maximum number of results to return", type=int
 )
@@ -122,10 +198,28 @@ def network_devices(
 @click.pass_obj
 @pretty_print
 def users(
-    controller, limit, offset, odata_expand, odata_filter, odata_orderby, odata_select
+    controller,
+    all_pages,
+    limit,
+    offset,
+    odata_expand,
+    odata_filter,
+    odata_orderby,
+    odata_select,
 ):
     """List users with SCM data"""
     with Spinner(description="Fetching users from partner"):
+        if all_pages:
+            return collect(
+                controller.iter_users(
+                    expand=odata_expand,
+                    filter=odata_filter,
+                    orderby=odata_orderby,
+                    select=odata_select,
+                    skip=offset,
+                    workers=4,
+                )
+            )
         return controller.users(
             expand=odata_expand,
             filter=odata_filter,
@@ -137,6 +231,12 @@ def users(
 
 
 @scm.command("software")
+@click.option(
+    "--all",
+    "all_pages",
+    is_flag=True,
+    help="fetch every page instead of --limit results",
+)
 @click.option(
     "--limit", default=100, help="maximum number of results to return", type=int
 )
@@ -148,9 +248,21 @@ def users(
 )
 @click.pass_obj
 @pretty_print
-def software(controller, limit, offset, odata_filter, odata_orderby, odata_select):
+def software(
+    controller, all_pages, limit, offset, odata_filter, odata_orderby, odata_select
+):
     """List software with SCM data"""
     with Spinner(description="Fetching software from partner"):
+        if all_pages:
+            return collect(
+                controller.iter_software(
+                    filter=odata_filter,
+                    orderby=odata_orderby,
+                    select=odata_select,
+                    skip=offset,
+                    workers=4,
+                )
+            )
         return controller.software(
             filter=odata_filter,
             orderby=odata_orderby,
@@ -257,9 +369,7 @@ def sync(controller, partner, instance_id):
             partner=Control[partner], instance_id=instance_id
         )["job_id"]
         jobs = JobsController(account=controller.account)
-        while (result := jobs.job_status(job_id))["end_time"] is None:
-            sleep(3)
-        return result
+        return jobs.wait_for_job(job_id)
 
 
 @scm.command("export")
@@ -279,11 +389,34 @@ def sync(controller, partner, instance_id):
 @click.option("--limit", help="maximum number of results to return", type=int)
 @click.option("--odata_filter", help="OData filter string")
 @click.option("--odata_orderby", help="OData orderby string")
+@click.option("--gzip", is_flag=True, help="gzip the csv while writing it")
+@click.option(
+    "--connections",
+    default=1,
+    help="download with this many parallel range requests (not with --gzip)",
+    type=int,
+)
 @click.pass_obj
 @pretty_print
-def export(controller, type, output_file, limit, odata_filter, odata_orderby):
+def export(
+    controller,
+    type,
+    output_file,
+    limit,
+    odata_filter,
+    odata_orderby,
+    gzip,
+    connections,
+):
     """Export SCM data"""
-    with Spinner(description="Exporting SCM data"):
+
+    def progress(written, rate):
+        spinner.update(
+            spinner.task_ids[-1],
+            description=f"Downloading ({written / 1e6:.1f} MB, {rate / 1e6:.1f} MB/s)",
+        )
+
+    with Spinner(description="Exporting SCM data") as spinner:
         export = ExportController(account=controller.account)
         jobs = JobsController(account=controller.account)
         job_id = export.export_scm(
@@ -292,12 +425,22 @@ def export(controller, type, output_file, limit, odata_filter, odata_orderby):
             orderby=odata_orderby,
             top=limit,
         )["job_id"]
-        while (result := jobs.job_status(job_id))["end_time"] is None:
-            sleep(3)
+        result = jobs.wait_for_job(job_id)
         if result["successful"]:
-            data = requests.get(result["results"]["url"], timeout=10).content
-            with open(output_file, "wb") as f:
-                f.write(data)
+            if connections > 1 and not gzip:
+                export.download_ranges(
+                    result["results"]["url"],
+                    output_file,
+                    connections=connections,
+                    progress=progress,
+                )
+            else:
+                export.download(
+                    result["results"]["url"],
+                    output_file,
+                    compress=gzip,
+                    progress=progress,
+                )
         return result, f"Exported data to {output_file}"
 
 
@@ -345,9 +488,7 @@ def sync_groups(controller, partner, instance_id, group_ids):
             group_ids=group_ids.split(","),
         )["job_id"]
         jobs = JobsController(account=controller.account)
-        while (result := jobs.job_status(job_id))["end_time"] is None:
-            sleep(3)
-        return result
+        return jobs.wait_for_job(job_id)
 
 
 @click.group()
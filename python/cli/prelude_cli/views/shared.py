@@ -1,27 +1,98 @@
+import click
+import csv
+import json
+import sys
+
+from collections.abc import Iterator
 from functools import wraps
 from rich import print_json
 from rich.progress import Progress, TextColumn, SpinnerColumn
 
 
+def output_format():
+    ctx = click.get_current_context(silent=True)
+    return ctx.meta.get("output", "pretty") if ctx else "pretty"
+
+
+def collect(records):
+    """Keep paginated results lazy for streamed output; materialize them for pretty printing"""
+    return list(records) if output_format() == "pretty" else records
+
+
+def _csv_value(value):
+    return json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+
+
+def _select_fields(select):
+    """Top-level columns named by an OData $select, in order"""
+    fields = [field.strip().split("/")[0] for field in (select or "").split(",")]
+    return list(dict.fromkeys(field for field in fields if field)) or None
+
+
+def _stream(records, msg, output, fields=None):
+    """
+    Write records to stdout as they are produced, without building the full document.
+    CSV columns are `fields` if given, else the first record's keys; keys that appear
+    only in later records are reported on stderr, since streaming cannot add columns.
+    """
+    out = sys.stdout
+    if output == "ndjson":
+        for record in records:
+            out.write(json.dumps(record, default=str) + "\n")
+    elif output == "csv":
+        writer = None
+        dropped = set()
+        for record in records:
+            if not isinstance(record, dict):
+                record = dict(value=record)
+            if writer is None:
+                writer = csv.DictWriter(
+                    out, fieldnames=fields or list(record), extrasaction="ignore"
+                )
+                writer.writeheader()
+            if not fields and (extra := record.keys() - writer.fieldnames - dropped):
+                dropped |= extra
+                click.echo(
+                    f"Warning: columns not in the first record were dropped: {', '.join(sorted(extra))}. "
+                    "Pass --odata_select to choose the columns.",
+                    err=True,
+                )
+            writer.writerow({k: _csv_value(v) for k, v in record.items()})
+    else:
+        out.write('{"status": "complete", "results": [')
+        for i, record in enumerate(records):
+            out.write(("" if i == 0 else ", ") + json.dumps(record, default=str))
+        out.write(f'], "message": {json.dumps(msg, default=str)}}}\n')
+    out.flush()
+
+
 def pretty_print(func):
     @wraps(func)
     def handler(*args, **kwargs):
+        output = output_format()
         try:
             res = func(*args, **kwargs)
             msg = None
             if isinstance(res, tuple):
                 res, msg = res
-            if not isinstance(res, list):
+            if not isinstance(res, (list, Iterator)):
                 res = [res]
-            return print_json(data=dict(status="complete", results=res, message=msg))
-        except Exception as e:
+            if output != "pretty":
+                fields = _select_fields(kwargs.get("odata_select"))
+                return _stream(res, msg, output, fields=fields)
             return print_json(
-                data=dict(
-                    status="error",
-                    results=None,
-                    message=" ".join(str(arg) for arg in e.args),
-                )
+                data=dict(status="complete", results=list(res), message=msg)
+            )
+        except Exception as e:
+            error = dict(
+                status="error",
+                results=None,
+                message=" ".join(str(arg) for arg in e.args),
             )
+            if output == "pretty":
+                return print_json(data=error)
+            click.echo(json.dumps(error), err=True)
+            sys.exit(1)
 
     return handler
 
@@ -33,5 +104,6 @@ class Spinner(Progress):
             TextColumn("[green]{task.description}..."),
             transient=True,
             refresh_per_second=10,
+            disable=output_format() != "pretty",
         )
         self.add_task(description)
@@ -0,0 +1,15 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--timing",
+        action="store_true",
+        default=False,
+        help="Enable wall-clock performance tests",
+    )
+
+
+@pytest.fixture(scope="session")
+def timing(pytestconfig):
+    return pytestconfig.getoption("timing")
@@ -0,0 +1,19 @@
+from prelude_cli.views.shared import _select_fields, _stream
+
+RECORDS = [dict(id=1), dict(id=2, hostname="h", os="linux")]
+
+
+class TestCsvOutput:
+    def test_warns_on_columns_missing_from_first_record(self, capsys):
+        _stream(iter(RECORDS), None, "csv")
+        out, err = capsys.readouterr()
+        assert out.splitlines() == ["id", "1", "2"]
+        assert "hostname, os" in err
+
+    def test_select_sets_columns(self, capsys):
+        fields = _select_fields("id, hostname, instances/control")
+        assert fields == ["id", "hostname", "instances"]
+        _stream(iter(RECORDS), None, "csv", fields=fields)
+        out, err = capsys.readouterr()
+        assert out.splitlines() == ["id,hostname,instances", "1,,", "2,h,"]
+        assert err == ""
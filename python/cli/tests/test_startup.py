@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+CLI_ROOT = Path(__file__).parents[1]
+BUDGET = 0.2
+CEILING = 1.0
+HEAVY = ("rich", "requests", "yaml", "dateutil", "prelude_sdk", "prelude_cli.views")
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from prelude_cli.cli import cli
+try:
+    cli(sys.argv[1:], prog_name="prelude")
+except SystemExit:
+    pass
+print(time.perf_counter() - start, *sys.modules, file=sys.stderr)
+"""
+
+
+def run(*args, **env):
+    res = subprocess.run(
+        [sys.executable, "-c", SCRIPT, *args],
+        cwd=CLI_ROOT,
+        env=dict(os.environ, PYTHONPATH=str(CLI_ROOT), **env),
+        capture_output=True,
+        text=True,
+    )
+    elapsed, *modules = res.stderr.splitlines()[-1].split()
+    return res.stdout, float(elapsed), modules
+
+
+class TestStartup:
+    @pytest.mark.parametrize(
+        "args,env",
+        [
+            (["--help"], {}),
+            (
+                [],
+                dict(
+                    _PRELUDE_COMPLETE="bash_complete",
+                    COMP_WORDS="prelude s",
+                    COMP_CWORD="1",
+                ),
+            ),
+        ],
+    )
+    def test_skips_heavy_imports(self, args, env, timing):
+        stdout, elapsed, modules = run(*args, **env)
+        assert "scm" in stdout
+        assert not [m for m in modules if m.startswith(HEAVY)]
+        assert elapsed < (BUDGET if timing else CEILING), f"{elapsed * 1000:.0f}ms"
+
+    def test_profile_completion_uses_index(self, tmp_path, timing):
+        keychain = tmp_path / ".prelude" / "keychain.ini"
+        keychain.parent.mkdir()
+        keychain.write_text("[default]\naccount = a\n\n[dev]\naccount = b\n")
+        env = dict(
+            HOME=str(tmp_path),
+            _PRELUDE_COMPLETE="bash_complete",
+            COMP_WORDS="prelude --profile d",
+            COMP_CWORD="2",
+        )
+
+        for _ in range(2):
+            stdout, elapsed, modules = run(**env)
+            assert stdout.split() == ["plain,default", "plain,dev"]
+            assert not [m for m in modules if m.startswith(HEAVY)]
+            assert elapsed < (BUDGET if timing else CEILING), f"{elapsed * 1000:.0f}ms"
+        assert (keychain.parent / "profiles.json").exists()
+        assert not (keychain.parent / "tokens.json").exists()
@@ -0,0 +1,147 @@
+import asyncio
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from prelude_sdk.controllers.build_controller import BuildController
+from prelude_sdk.controllers.detect_controller import DetectController
+from prelude_sdk.controllers.async_http_controller import (
+    PRELUDE_ASYNC_MAX_CONNECTIONS,
+    async_controller,
+    httpx,
+    new_client,
+)
+from prelude_sdk.controllers.export_controller import ExportController
+from prelude_sdk.controllers.generate_controller import GenerateController
+from prelude_sdk.controllers.http_controller import shared_session
+from prelude_sdk.controllers.iam_controller import (
+    IAMAccountController,
+    IAMUserController,
+)
+from prelude_sdk.controllers.jobs_controller import JobsController
+from prelude_sdk.controllers.partner_controller import PartnerController
+from prelude_sdk.controllers.probe_controller import ProbeController
+from prelude_sdk.controllers.scm_controller import ScmController
+
+
+class _AsyncProxy:
+    """
+    Expose every public method of a controller as a coroutine: natively through the
+    async twin when it has one, otherwise by running the blocking method on the worker
+    pool. Each iter_* method becomes an async iterator that pulls one page of records
+    at a time on the pool.
+    """
+
+    def __init__(self, controller, executor, native=None):
+        self._controller = controller
+        self._executor = executor
+        self._native = native
+
+    def __getattr__(self, name):
+        if self._native is not None and name in vars(type(self._native)):
+            return getattr(self._native, name)
+        attr = getattr(self._controller, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        if name.startswith("iter_"):
+            return self._iterate(attr)
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(attr, *args, **kwargs)
+            )
+
+        return method
+
+    def _iterate(self, attr):
+        @functools.wraps(attr)
+        async def iterate(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            records = attr(*args, **kwargs)
+            size = kwargs.get("page_size") or 1000
+            try:
+                while batch := await loop.run_in_executor(
+                    self._executor, list, itertools.islice(records, size)
+                ):
+                    for record in batch:
+                        yield record
+            finally:
+                if close := getattr(records, "close", None):
+                    await loop.run_in_executor(self._executor, close)
+
+        return iterate
+
+
+class AsyncController:
+    """
+    Awaitable access to every controller
+
+    With the async extra installed (pip install prelude-sdk[async]), methods that only
+    send requests run natively on the event loop through one httpx.AsyncClient, so
+    thousands of requests can be in flight from a single thread, bounded by
+    max_connections. Rate limiting, retries, circuit breaking, hooks, response caching
+    and the 401 refresh behave as in HttpController. Methods that do more (file
+    transfers, multi-step waits, iter_* methods) and every method when httpx is not
+    installed or native=False run the blocking controller on a pool of max_workers
+    threads over the account's shared connection pool. iter_* methods become async
+    iterators, e.g. `async for endpoint in client.scm.iter_endpoints(workers=4)`.
+
+    Example:
+        async with AsyncController(account, max_connections=512) as client:
+            pages = await asyncio.gather(
+                *[client.scm.endpoints(top=1000, skip=i * 1000) for i in range(500)]
+            )
+    """
+
+    def __init__(
+        self,
+        account,
+        max_workers: int = 32,
+        max_connections: int = PRELUDE_ASYNC_MAX_CONNECTIONS,
+        native: bool = None,
+        client=None,
+    ):
+        """client: an httpx.AsyncClient to send native requests through, left open on close"""
+        self.account = account
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="prelude-sdk"
+        )
+        shared_session(account, pool_maxsize=max_workers)
+        if native is None:
+            native = httpx is not None
+        self._owns_client = native and client is None
+        self._client = (client or new_client(max_connections)) if native else None
+
+        self.build = self._wrap(BuildController)
+        self.detect = self._wrap(DetectController)
+        self.export = self._wrap(ExportController)
+        self.generate = self._wrap(GenerateController)
+        self.iam_account = self._wrap(IAMAccountController)
+        self.iam_user = self._wrap(IAMUserController)
+        self.jobs = self._wrap(JobsController)
+        self.partner = self._wrap(PartnerController)
+        self.probe = self._wrap(ProbeController)
+        self.scm = self._wrap(ScmController)
+
+    def _wrap(self, controller_class):
+        native = None
+        if self._client is not None:
+            native = async_controller(controller_class, self.account, self._client)
+        return _AsyncProxy(controller_class(self.account), self._executor, native)
+
+    def close(self):
+        """Stop the worker pool; aclose() also closes the httpx client"""
+        self._executor.shutdown(wait=True)
+
+    async def aclose(self):
+        if self._owns_client:
+            await self._client.aclose()
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.aclose()
@@ -0,0 +1,362 @@
+import ast
+import asyncio
+import inspect
+import os
+import sys
+import time
+
+from prelude_sdk.controllers.http_controller import HttpController
+from prelude_sdk.models.errors import APIError, TransientError
+from prelude_sdk.models.instrumentation import route_template
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+PRELUDE_ASYNC_MAX_CONNECTIONS = int(os.getenv("PRELUDE_ASYNC_MAX_CONNECTIONS", 256))
+
+_REQUESTS = frozenset(["get", "post", "put", "delete"])
+_BLOCKING = frozenset(
+    ["cache", "open", "requests", "sleep", "super", "ThreadPoolExecutor"]
+)
+_TRANSIENT = (
+    (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+    if httpx
+    else ()
+)
+
+
+def new_client(max_connections: int = PRELUDE_ASYNC_MAX_CONNECTIONS):
+    """Create the httpx client an AsyncHttpController sends through"""
+    if httpx is None:
+        raise ImportError(
+            "Native async requests need httpx: pip install prelude-sdk[async]"
+        )
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+    )
+
+
+class AsyncHttpController(HttpController):
+    """
+    HttpController whose get, post, put and delete are coroutines sent through an
+    httpx.AsyncClient, with the same rate limiting, retries, circuit breaking, hooks,
+    response caching and 401 refresh. Build one for a controller with async_controller().
+    """
+
+    def __init__(self, account, client):
+        super().__init__(account)
+        self._client = client
+
+    async def _send(self, method, url, timeout, headers, safe=False, **kwargs):
+        limiter = self.account.rate_limiter
+        policy = self.account.retry_policy
+        breaker = self.account.circuit_breaker
+        route = route_template(url) if self.account.hooks else None
+        if params := kwargs.get("params"):
+            kwargs["params"] = {k: v for k, v in params.items() if v is not None}
+        if isinstance(kwargs.get("data"), (bytes, str)):
+            kwargs["content"] = kwargs.pop("data")
+        attempts, failures, throttled, delay = 0, 0, 0, 0
+        while True:
+            attempts += 1
+            if breaker:
+                circuit = breaker.before(method, url)
+            try:
+                if limiter:
+                    await limiter.acquire_async()
+                if policy:
+                    policy.record_request()
+                self._emit("before_request", method, route, attempts)
+                sent = time.monotonic()
+                res = await self._client.request(
+                    method, url, timeout=timeout, headers=headers, **kwargs
+                )
+            except _TRANSIENT as e:
+                self._emit(
+                    "after_response",
+                    method,
+                    route,
+                    None,
+                    0,
+                    0,
+                    time.monotonic() - sent,
+                    attempts - 1,
+                )
+                if breaker:
+                    breaker.record(circuit, success=False)
+                failures += 1
+                unsent = isinstance(e, (httpx.ConnectTimeout, httpx.PoolTimeout))
+                if policy and policy.allows(method, failures, safe=safe or unsent):
+                    delay = policy.backoff(delay)
+                    self._emit(
+                        "on_retry", method, route, type(e).__name__, attempts, delay
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                e.attempts = attempts
+                raise
+            except BaseException:
+                if breaker:
+                    breaker.release(circuit)
+                raise
+            self._emit(
+                "after_response",
+                method,
+                route,
+                res.status_code,
+                len(res.request.content),
+                len(res.content),
+                time.monotonic() - sent,
+                attempts - 1,
+            )
+            if breaker:
+                breaker.record(circuit, success=res.status_code < 500)
+            if limiter:
+                pause = limiter.update(res)
+                if res.status_code == 429 and throttled < limiter.max_retries:
+                    throttled += 1
+                    self._emit("on_retry", method, route, "429", attempts, pause)
+                    continue
+            if policy and res.status_code in policy.statuses:
+                failures += 1
+                if policy.allows(method, failures, safe=safe):
+                    delay = policy.backoff(delay)
+                    self._emit(
+                        "on_retry",
+                        method,
+                        route,
+                        str(res.status_code),
+                        attempts,
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+            return res, attempts
+
+    async def _request(
+        self, method, url, retry=True, timeout=10, headers=None, safe=False, **kwargs
+    ):
+        started = time.monotonic()
+        headers = headers or self.account.headers
+        authorization = headers.get("authorization", "")
+        cache, cache_key = self._cache_key(method, url, headers, kwargs.get("params"))
+        try:
+            res, attempts = await self._send(
+                method,
+                url,
+                timeout,
+                headers | cache.validators(cache_key) if cache_key else headers,
+                safe=safe,
+                **kwargs,
+            )
+        except _TRANSIENT as e:
+            raise TransientError(
+                str(e) or type(e).__name__,
+                method=method,
+                url=url,
+                latency=time.monotonic() - started,
+                attempts=getattr(e, "attempts", 1),
+            ) from e
+        if res.status_code == 304 and cache_key:
+            return cache.load(cache_key) or res
+        if res.status_code == 200 or res.status_code == 304:
+            if cache_key:
+                cache.store(cache_key, res)
+            return res
+        if res.status_code == 401 and retry and self.account.token_location:
+            stale_token = authorization.removeprefix("Bearer ")
+            await asyncio.to_thread(
+                self.account.refresh_tokens,
+                stale_token=stale_token or None,
+                reason="401",
+                method=method,
+                route=route_template(url),
+            )
+            self.account.update_auth_header()
+            headers = headers | dict(
+                authorization=self.account.headers["authorization"]
+            )
+            return await self._request(
+                method,
+                url,
+                retry=False,
+                timeout=timeout,
+                headers=headers,
+                safe=safe,
+                **kwargs,
+            )
+        error = TransientError if res.status_code >= 500 else APIError
+        raise error(
+            res.text,
+            status=res.status_code,
+            method=method,
+            url=url,
+            latency=time.monotonic() - started,
+            attempts=attempts,
+        )
+
+    async def get(self, url, retry=True, timeout=10, headers=None, **kwargs):
+        return await self._request(
+            "GET", url, retry=retry, timeout=timeout, headers=headers, **kwargs
+        )
+
+    async def post(
+        self, url, retry=True, timeout=10, headers=None, safe=False, **kwargs
+    ):
+        """Set safe=True to let transient failures be retried for an idempotent POST"""
+        return await self._request(
+            "POST",
+            url,
+            retry=retry,
+            timeout=timeout,
+            headers=headers,
+            safe=safe,
+            **kwargs,
+        )
+
+    async def delete(self, url, retry=True, timeout=10, headers=None, **kwargs):
+        return await self._request(
+            "DELETE", url, retry=retry, timeout=timeout, headers=headers, **kwargs
+        )
+
+    async def put(self, url, retry=True, timeout=10, headers=None, **kwargs):
+        return await self._request(
+            "PUT", url, retry=retry, timeout=timeout, headers=headers, **kwargs
+        )
+
+
+class _Awaiter(ast.NodeTransformer):
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if _self_call(node) in _REQUESTS:
+            return ast.Await(value=node)
+        return node
+
+
+def _self_call(node) -> str | None:
+    """Name of the method for a self.<name>(...) call"""
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "self"
+    ):
+        return node.func.attr
+    return None
+
+
+def _convertible(node: ast.FunctionDef, cls) -> bool:
+    """
+    Whether a method is request calls plus in-memory work: no other controller methods,
+    nested functions, generators, raw session use or blocking calls the loop would stall on
+    """
+    allowed = _REQUESTS | {"resolve_enums"}
+    requests = 0
+    for decorator in node.decorator_list:
+        if not (
+            isinstance(decorator, ast.Name) and decorator.id == "verify_credentials"
+        ) and not (
+            isinstance(decorator, ast.Call)
+            and isinstance(decorator.func, ast.Name)
+            and decorator.func.id in ("memoize", "invalidates")
+        ):
+            return False
+    for child in ast.walk(ast.Module(body=node.body, type_ignores=[])):
+        if isinstance(
+            child,
+            (
+                ast.FunctionDef,
+                ast.AsyncFunctionDef,
+                ast.Lambda,
+                ast.Yield,
+                ast.YieldFrom,
+            ),
+        ):
+            return False
+        if isinstance(child, ast.Name) and child.id in _BLOCKING:
+            return False
+        if isinstance(child, ast.Attribute) and child.attr in _BLOCKING | {"_session"}:
+            return False
+        if name := _self_call(child):
+            if name in _REQUESTS:
+                requests += 1
+            elif name not in allowed and not isinstance(
+                inspect.getattr_static(cls, name, None), staticmethod
+            ):
+                return False
+    return requests > 0
+
+
+def _native_methods(cls) -> dict:
+    """
+    Async versions of the controller's public methods that only send requests and
+    reshape the results, compiled from their source with every self.get, self.post,
+    self.put and self.delete awaited. Other methods are left to the caller to run
+    on a thread.
+    """
+    methods = dict()
+    for klass in reversed(cls.__mro__):
+        if not issubclass(klass, HttpController) or klass is HttpController:
+            continue
+        try:
+            lines, first = inspect.getsourcelines(klass)
+            filename = inspect.getsourcefile(klass)
+        except (OSError, TypeError):
+            continue
+        tree = ast.parse("".join(lines))
+        ast.increment_lineno(tree, first - 1)
+        module = vars(sys.modules[klass.__module__])
+        for node in tree.body[0].body:
+            if not isinstance(node, ast.FunctionDef) or node.name.startswith("_"):
+                continue
+            methods.pop(node.name, None)
+            if not _convertible(node, klass):
+                continue
+            node = _Awaiter().visit(node)
+            # defaults may name class attributes; they are copied from the original
+            node.args.defaults = [ast.Constant(None) for _ in node.args.defaults]
+            node.args.kw_defaults = [
+                default and ast.Constant(None) for default in node.args.kw_defaults
+            ]
+            function = ast.AsyncFunctionDef(
+                **{f: getattr(node, f) for f in node._fields}
+            )
+            # compiled inside a class of the same name so __qualname__, and with it
+            # the memo cache key, matches the blocking method
+            holder = ast.parse(f"class {klass.__name__}: pass").body[0]
+            holder.body = [ast.copy_location(function, node)]
+            code = ast.fix_missing_locations(ast.Module(body=[holder], type_ignores=[]))
+            namespace = dict(module)
+            exec(compile(code, filename, "exec"), namespace)
+            method = vars(namespace[klass.__name__])[node.name]
+            original = inspect.unwrap(vars(klass)[node.name])
+            inspect.unwrap(method).__defaults__ = original.__defaults__
+            inspect.unwrap(method).__kwdefaults__ = original.__kwdefaults__
+            methods[node.name] = method
+    return methods
+
+
+_async_classes = dict()
+
+
+def async_controller(controller_class, account, client):
+    """
+    An instance of controller_class whose request-only public methods are coroutines
+    sent through client; any other public method is still the blocking original
+    """
+    if controller_class not in _async_classes:
+        _async_classes[controller_class] = type(
+            f"Async{controller_class.__name__}",
+            (AsyncHttpController, controller_class),
+            dict(
+                _native_methods(controller_class),
+                __module__=__name__,
+            ),
+        )
+    return _async_classes[controller_class](account, client)
@@ -1,5 +1,14 @@
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
 from prelude_sdk.controllers.http_controller import HttpController
 from prelude_sdk.models.account import verify_credentials
+from prelude_sdk.models.attachment_cache import AttachmentCache
 from prelude_sdk.models.codes import Control, RunCode
 
 
@@ -52,13 +61,68 @@ class DetectController(HttpController):
         return endpoints
 
     @verify_credentials
-    def describe_activity(self, filters: dict, view: str = "protected"):
-        """Get report for an Account"""
+    def describe_activity(
+        self,
+        filters: dict,
+        view: str = "protected",
+        shard: timedelta = None,
+        workers: int = 8,
+    ):
+        """Get report for an Account; the logs view can be fetched in time shards"""
+        if shard:
+            if view != "logs":
+                raise ValueError("Only the logs view can be fetched in time shards")
+            return list(self.iter_activity(filters, shard=shard, workers=workers))
         params = dict(view=view, **filters)
 
         res = self.get(f"{self.account.hq}/detect/activity", params=params)
         return res.json()
 
+    @staticmethod
+    def _shards(start, finish, shard: timedelta):
+        start, finish = (
+            d if isinstance(d, datetime) else datetime.fromisoformat(d)
+            for d in (start, finish)
+        )
+        while start <= finish:
+            yield start, min(start + shard - timedelta(microseconds=1), finish)
+            start += shard
+
+    def iter_activity(
+        self,
+        filters: dict,
+        shard: timedelta = timedelta(days=1),
+        workers: int = 8,
+        sort_key: str = "created",
+    ):
+        """
+        Lazily fetch the logs view between filters' start and finish, one request per
+        shard of time. Up to `workers` shards are in flight at once, so at most
+        `workers` shards are held in memory. Records are yielded oldest first: shards
+        in time order, each sorted on sort_key, with records lacking it at the end.
+        """
+        shards = self._shards(filters["start"], filters["finish"], shard)
+
+        def fetch(start, finish):
+            return self.describe_activity(
+                dict(filters, start=start, finish=finish), view="logs"
+            )
+
+        self._reserve_connections(workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque(
+                executor.submit(fetch, *window)
+                for window in itertools.islice(shards, workers)
+            )
+            while pending:
+                records = pending.popleft().result()
+                if window := next(shards, None):
+                    pending.append(executor.submit(fetch, *window))
+                yield from sorted(
+                    records,
+                    key=lambda r: (r.get(sort_key) is None, str(r.get(sort_key))),
+                )
+
     @verify_credentials
     def threat_hunt_activity(self, threat_hunt_id=None, test_id=None, threat_id=None):
         """Get threat hunt activity"""
@@ -144,10 +208,85 @@ class DetectController(HttpController):
         return res.json()
 
     @verify_credentials
-    def download(self, test_id, filename):
-        """Clone a test file or attachment"""
-        res = self.get(f"{self.account.hq}/detect/tests/{test_id}/{filename}")
-        return res.content
+    def download(self, test_id, filename, cache: AttachmentCache = None):
+        """Clone a test file or attachment, revalidating against the cache if given"""
+        url = f"{self.account.hq}/detect/tests/{test_id}/{filename}"
+        if not cache:
+            return self.get(url).content
+
+        entry = cache.get(test_id, filename)
+        res = self.get(url, headers=self.account.headers | cache.validators(entry))
+        if res.status_code == 304:
+            return cache.read(entry)
+        return cache.put(
+            test_id,
+            filename,
+            res.content,
+            etag=res.headers.get("ETag"),
+            last_modified=res.headers.get("Last-Modified"),
+        )
+
+    def clone_tests(
+        self,
+        test_ids: list[str] = None,
+        output_dir: str = ".",
+        max_workers: int = 8,
+        progress=None,
+        cache: AttachmentCache = None,
+    ):
+        """
+        Download every attachment of the given tests (all tests if none are given) to
+        output_dir/<test_id>/, using up to max_workers concurrent requests. Transient
+        failures are retried by the account's retry policy; files that still fail are
+        listed in the summary.
+        progress(completed, total) is called as each file finishes. With a cache,
+        unchanged attachments are revalidated and served from disk.
+        """
+        start = time.monotonic()
+        if test_ids is None:
+            test_ids = [test["id"] for test in self.list_tests()]
+        summary = dict(tests=len(test_ids), files=0, bytes=0, failed=[])
+        lock = threading.Lock()
+
+        def fetch(test_id, filename):
+            code = self.download(test_id, filename, cache)
+            with open(os.path.join(output_dir, test_id, filename), "wb") as f:
+                f.write(code)
+            with lock:
+                summary["files"] += 1
+                summary["bytes"] += len(code)
+
+        self._reserve_connections(max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            tests = {
+                executor.submit(self.get_test, test_id): test_id for test_id in test_ids
+            }
+            downloads = dict()
+            for future in as_completed(tests):
+                test_id = tests[future]
+                try:
+                    attachments = future.result().get("attachments") or []
+                except Exception as e:
+                    summary["failed"].append(dict(test_id=test_id, error=str(e)))
+                    continue
+                os.makedirs(os.path.join(output_dir, test_id), exist_ok=True)
+                for filename in attachments:
+                    download = executor.submit(fetch, test_id, filename)
+                    downloads[download] = (test_id, filename)
+            for completed, future in enumerate(as_completed(downloads), start=1):
+                try:
+                    future.result()
+                except Exception as e:
+                    test_id, filename = downloads[future]
+                    summary["failed"].append(
+                        dict(test_id=test_id, filename=filename, error=str(e))
+                    )
+                if progress:
+                    progress(completed, len(downloads))
+        if cache:
+            cache.save()
+        summary["seconds"] = round(time.monotonic() - start, 3)
+        return summary
 
     @verify_credentials
     def schedule(self, items: list):
@@ -1,3 +1,14 @@
+import gzip
+import json
+import math
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
 from prelude_sdk.controllers.http_controller import HttpController
 from prelude_sdk.models.account import verify_credentials
 from prelude_sdk.models.codes import SCMCategory
@@ -25,3 +36,128 @@ class ExportController(HttpController):
 
         res = self.post(f"{self.account.hq}/export/scm/{export_type.name}", json=body)
         return res.json()
+
+    def download(
+        self,
+        url: str,
+        output_file: str,
+        compress: bool = False,
+        chunk_size: int = 1024 * 1024,
+        progress=None,
+    ):
+        """
+        Stream a finished export's result URL to disk in chunks, gzipping on the fly if
+        compress is set. progress(bytes_written, bytes_per_second) is called per chunk.
+        """
+        written = 0
+        start = time.monotonic()
+        with self._session.get(url, stream=True, timeout=30) as res:
+            if not res.ok:
+                raise Exception(res.text)
+            with (gzip.open if compress else open)(output_file, "wb") as f:
+                for chunk in res.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+                    if progress:
+                        progress(written, written / (time.monotonic() - start))
+        elapsed = time.monotonic() - start
+        return dict(bytes=written, seconds=round(elapsed, 3), output_file=output_file)
+
+    def download_ranges(
+        self,
+        url: str,
+        output_file: str,
+        connections: int = 4,
+        retries: int = 3,
+        chunk_size: int = 1024 * 1024,
+        progress=None,
+    ):
+        """
+        Download a finished export's result URL over several connections using HTTP
+        range requests. Each range is written to its own part file, so a failed or
+        interrupted download resumes where it stopped when called again. Falls back
+        to a single stream if the server does not honor ranges.
+        """
+        with self._session.get(
+            url, headers=dict(Range="bytes=0-0"), stream=True, timeout=30
+        ) as res:
+            if res.status_code != 206:
+                return self.download(
+                    url, output_file, chunk_size=chunk_size, progress=progress
+                )
+            size = int(res.headers["Content-Range"].rsplit("/", 1)[1])
+            etag = res.headers.get("ETag")
+
+        manifest_file = f"{output_file}.parts.json"
+        manifest = dict(size=size, etag=etag)
+        if os.path.exists(manifest_file):
+            with open(manifest_file) as f:
+                previous = json.load(f)
+            if (previous["size"], previous["etag"]) == (size, etag):
+                manifest = previous
+            else:
+                for i in range(len(previous["segments"])):
+                    if os.path.exists(part := f"{output_file}.part{i}"):
+                        os.remove(part)
+        if "segments" not in manifest:
+            step = math.ceil(size / connections)
+            manifest["segments"] = [
+                (start, min(start + step, size) - 1) for start in range(0, size, step)
+            ]
+            with open(manifest_file, "w") as f:
+                json.dump(manifest, f)
+
+        parts = [f"{output_file}.part{i}" for i in range(len(manifest["segments"]))]
+        lock = threading.Lock()
+        written = sum(os.path.getsize(p) for p in parts if os.path.exists(p))
+        start_time = time.monotonic()
+
+        def fetch(part, start, end):
+            nonlocal written
+            attempt = 0
+            while (offset := start + _size(part)) <= end:
+                try:
+                    with self._session.get(
+                        url,
+                        headers=dict(Range=f"bytes={offset}-{end}"),
+                        stream=True,
+                        timeout=30,
+                    ) as res:
+                        if res.status_code != 206:
+                            raise Exception(res.text)
+                        with open(part, "ab") as f:
+                            for chunk in res.iter_content(chunk_size=chunk_size):
+                                f.write(chunk)
+                                with lock:
+                                    written += len(chunk)
+                                    if progress:
+                                        elapsed = time.monotonic() - start_time
+                                        progress(written, written / elapsed)
+                except requests.exceptions.RequestException:
+                    if (attempt := attempt + 1) > retries:
+                        raise
+                    time.sleep(2**attempt)
+
+        self._reserve_connections(connections)
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            for future in [
+                executor.submit(fetch, part, start, end)
+                for part, (start, end) in zip(parts, manifest["segments"])
+            ]:
+                future.result()
+
+        if (actual := sum(_size(p) for p in parts)) != size:
+            raise Exception(f"Downloaded {actual} bytes, expected {size}")
+        with open(output_file, "wb") as f:
+            for part in parts:
+                with open(part, "rb") as p:
+                    shutil.copyfileobj(p, f, chunk_size)
+        for part in parts:
+            os.remove(part)
+        os.remove(manifest_file)
+        elapsed = time.monotonic() - start_time
+        return dict(bytes=size, seconds=round(elapsed, 3), output_file=output_file)
+
+
+def _size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
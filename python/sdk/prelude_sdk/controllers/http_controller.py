@@ -1,99 +1,365 @@
+import functools
 import os
+import threading
+import time
 import requests
 
 from requests.adapters import HTTPAdapter, Retry
 
+from prelude_sdk.models.errors import APIError, TransientError
+from prelude_sdk.models.instrumentation import route_template
+
 
 PRELUDE_BACKOFF_FACTOR = int(os.getenv("PRELUDE_BACKOFF_FACTOR", 30))
 PRELUDE_BACKOFF_TOTAL = int(os.getenv("PRELUDE_BACKOFF_TOTAL", 0))
+PRELUDE_POOL_CONNECTIONS = int(os.getenv("PRELUDE_POOL_CONNECTIONS", 10))
+PRELUDE_POOL_MAXSIZE = int(os.getenv("PRELUDE_POOL_MAXSIZE", 10))
+
+
+class _PoolAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that can be retired when a larger pool replaces it: its idle
+    connections are closed as soon as the sends still using it have finished
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._active = 0
+        self._retired = False
+        self._active_lock = threading.Lock()
+
+    def send(self, *args, **kwargs):
+        with self._active_lock:
+            self._active += 1
+        try:
+            return super().send(*args, **kwargs)
+        finally:
+            with self._active_lock:
+                self._active -= 1
+                close = self._retired and not self._active
+            if close:
+                self.close()
+
+    def retire(self):
+        """Close the pool once idle; connections still streaming close on release"""
+        with self._active_lock:
+            self._retired = True
+            close = not self._active
+        if close:
+            self.close()
+
+
+def _mount(session, pool_connections: int, pool_maxsize: int):
+    retry = Retry(
+        total=PRELUDE_BACKOFF_TOTAL,
+        backoff_factor=PRELUDE_BACKOFF_FACTOR,
+        status_forcelist=[429],
+        raise_on_status=False,
+    )
+    adapter = _PoolAdapter(
+        pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry
+    )
+    replaced = {session.adapters.get(prefix) for prefix in ("http://", "https://")}
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    for old in replaced:
+        if isinstance(old, _PoolAdapter):
+            old.retire()
+
+
+def new_session(
+    pool_connections: int = PRELUDE_POOL_CONNECTIONS,
+    pool_maxsize: int = PRELUDE_POOL_MAXSIZE,
+):
+    """Create a requests session with the SDK's 429 retry policy mounted"""
+    session = requests.Session()
+    _mount(session, pool_connections, pool_maxsize)
+    return session
+
+
+_sessions = dict()
+_sessions_lock = threading.Lock()
+
+
+def shared_session(account, pool_connections: int = None, pool_maxsize: int = None):
+    """
+    Process-wide session for an account and hq, so every controller built for it reuses
+    the same keep-alive connections. Asking for a larger pool mounts a larger one and
+    retires the old one once its in-flight requests finish; it never shrinks.
+    """
+    key = (getattr(account, "hq", None), getattr(account, "account", None))
+    size = (
+        max(pool_connections or 0, PRELUDE_POOL_CONNECTIONS),
+        max(pool_maxsize or 0, PRELUDE_POOL_MAXSIZE),
+    )
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = (new_session(*size), size)
+        session, current = _sessions[key]
+        if size[0] > current[0] or size[1] > current[1]:
+            size = (max(size[0], current[0]), max(size[1], current[1]))
+            _mount(session, *size)
+            _sessions[key] = (session, size)
+        return session
+
+
+def close_sessions():
+    """Close and forget every shared session"""
+    with _sessions_lock:
+        for session, _ in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _forget_sessions():
+    """
+    In a forked child, drop the parent's sessions without closing them, so the child
+    opens its own connections instead of sharing the parent's keep-alive sockets
+    """
+    global _sessions_lock
+    _sessions_lock = threading.Lock()
+    _sessions.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_sessions)
+
+
+@functools.cache
+def _enum_table(enum_class):
+    """Map every raw form an API value can take (name, value, str(value)) to its name"""
+    table = {name: member.name for name, member in enum_class.__members__.items()}
+    for member in enum_class:
+        table[member.value] = member.name
+        table[str(member.value)] = member.name
+    return table
+
+
+def _resolve_enums(data, tables):
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict):
+                _resolve_enums(item, tables)
+    elif isinstance(data, dict):
+        for k, v in data.items():
+            if k in tables:
+                table, enum_class = tables[k]
+                if isinstance(v, list):
+                    for i, item in enumerate(v):
+                        v[i] = table[item] if item in table else enum_class[item].name
+                elif v is not None:
+                    data[k] = table[v] if v in table else enum_class[v].name
+            elif isinstance(v, (dict, list)):
+                _resolve_enums(v, tables)
 
 
 class HttpController(object):
     def __init__(self, account):
-        self._session = requests.Session()
+        self._session = shared_session(account)
         self.account = account
 
-        retry = Retry(
-            total=PRELUDE_BACKOFF_TOTAL,
-            backoff_factor=PRELUDE_BACKOFF_FACTOR,
-            status_forcelist=[429],
-        )
-
-        self._session.mount("http://", HTTPAdapter(max_retries=retry))
-        self._session.mount("https://", HTTPAdapter(max_retries=retry))
+    def _reserve_connections(self, count: int):
+        """Make sure the shared pool can hold `count` concurrent connections"""
+        shared_session(self.account, pool_maxsize=count)
 
     def resolve_enums(self, data, enum_params: list[tuple]):
-        for [enum_class, key] in enum_params:
-            self._resolve_enum(data, enum_class, key)
-
-    def _resolve_enum(self, data, enum_class, key):
-        if isinstance(data, list):
-            for item in data:
-                if isinstance(item, dict):
-                    self._resolve_enum(item, enum_class, key)
-        elif isinstance(data, dict):
-            for k, v in data.items():
-                if k == key:
-                    if isinstance(v, list):
-                        for i, item in enumerate(v):
-                            v[i] = enum_class[item].name
-                    elif v is not None:
-                        data[k] = enum_class[v].name
-                elif isinstance(v, dict) or isinstance(v, list):
-                    self._resolve_enum(v, enum_class, key)
+        tables = {
+            key: (_enum_table(enum_class), enum_class)
+            for enum_class, key in enum_params
+        }
+        _resolve_enums(data, tables)
 
-    def get(self, url, retry=True, timeout=10, headers=None, **kwargs):
-        res = self._session.get(
-            url, timeout=timeout, headers=headers or self.account.headers, **kwargs
-        )
-        if res.status_code == 200:
-            return res
-        if res.status_code == 401 and retry and self.account.token_location:
-            self.account.refresh_tokens()
-            self.account.update_auth_header()
-            return self.get(
-                url, retry=False, timeout=timeout, headers=headers, **kwargs
+    def _cache_key(self, method, url, headers, params):
+        """Key into the account's response cache for a GET the caller isn't revalidating"""
+        cache = self.account.http_cache
+        if (
+            not cache
+            or method != "GET"
+            or "If-None-Match" in headers
+            or "If-Modified-Since" in headers
+        ):
+            return None, None
+        return cache, cache.key(self.account.account, url, params)
+
+    def _emit(self, event: str, *args):
+        for hook in self.account.hooks:
+            try:
+                getattr(hook, event)(*args)
+            except Exception:
+                pass
+
+    def _send(self, method, url, timeout, headers, safe=False, **kwargs):
+        """
+        Send one logical request: pace it through the account's rate limiter, wait out
+        429s, resend the transient failures its retry policy allows, and fail fast while
+        the route's circuit is open
+        """
+        limiter = self.account.rate_limiter
+        policy = self.account.retry_policy
+        breaker = self.account.circuit_breaker
+        route = route_template(url) if self.account.hooks else None
+        attempts, failures, throttled, delay = 0, 0, 0, 0
+        while True:
+            attempts += 1
+            if breaker:
+                circuit = breaker.before(method, url)
+            try:
+                if limiter:
+                    limiter.acquire()
+                if policy:
+                    policy.record_request()
+                self._emit("before_request", method, route, attempts)
+                sent = time.monotonic()
+                res = self._session.request(
+                    method, url, timeout=timeout, headers=headers, **kwargs
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._emit(
+                    "after_response",
+                    method,
+                    route,
+                    None,
+                    0,
+                    0,
+                    time.monotonic() - sent,
+                    attempts - 1,
+                )
+                if breaker:
+                    breaker.record(circuit, success=False)
+                failures += 1
+                unsent = isinstance(e, requests.ConnectTimeout)
+                if policy and policy.allows(method, failures, safe=safe or unsent):
+                    delay = policy.backoff(delay)
+                    self._emit(
+                        "on_retry", method, route, type(e).__name__, attempts, delay
+                    )
+                    time.sleep(delay)
+                    continue
+                e.attempts = attempts
+                raise
+            except BaseException:
+                if breaker:
+                    breaker.release(circuit)
+                raise
+            body = res.request.body
+            self._emit(
+                "after_response",
+                method,
+                route,
+                res.status_code,
+                len(body) if isinstance(body, (bytes, str)) else 0,
+                len(res.content),
+                time.monotonic() - sent,
+                attempts - 1,
             )
-        raise Exception(res.text)
+            if breaker:
+                breaker.record(circuit, success=res.status_code < 500)
+            if limiter:
+                pause = limiter.update(res)
+                if res.status_code == 429 and throttled < limiter.max_retries:
+                    throttled += 1
+                    self._emit("on_retry", method, route, "429", attempts, pause)
+                    continue
+            if policy and res.status_code in policy.statuses:
+                failures += 1
+                if policy.allows(method, failures, safe=safe):
+                    delay = policy.backoff(delay)
+                    self._emit(
+                        "on_retry",
+                        method,
+                        route,
+                        str(res.status_code),
+                        attempts,
+                        delay,
+                    )
+                    time.sleep(delay)
+                    continue
+            return res, attempts
 
-    def post(self, url, retry=True, timeout=10, headers=None, **kwargs):
-        res = self._session.post(
-            url, timeout=timeout, headers=headers or self.account.headers, **kwargs
-        )
-        if res.status_code == 200:
+    def _request(
+        self, method, url, retry=True, timeout=10, headers=None, safe=False, **kwargs
+    ):
+        started = time.monotonic()
+        headers = headers or self.account.headers
+        authorization = headers.get("authorization", "")
+        cache, cache_key = self._cache_key(method, url, headers, kwargs.get("params"))
+        try:
+            res, attempts = self._send(
+                method,
+                url,
+                timeout,
+                headers | cache.validators(cache_key) if cache_key else headers,
+                safe=safe,
+                **kwargs,
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise TransientError(
+                str(e),
+                method=method,
+                url=url,
+                latency=time.monotonic() - started,
+                attempts=getattr(e, "attempts", 1),
+            ) from e
+        if res.status_code == 304 and cache_key:
+            return cache.load(cache_key) or res
+        if res.status_code == 200 or res.status_code == 304:
+            if cache_key:
+                cache.store(cache_key, res)
             return res
         if res.status_code == 401 and retry and self.account.token_location:
-            self.account.refresh_tokens()
+            stale_token = authorization.removeprefix("Bearer ")
+            self.account.refresh_tokens(
+                stale_token=stale_token or None,
+                reason="401",
+                method=method,
+                route=route_template(url),
+            )
             self.account.update_auth_header()
-            return self.post(
-                url, retry=False, timeout=timeout, headers=headers, **kwargs
+            headers = headers | dict(
+                authorization=self.account.headers["authorization"]
             )
-        raise Exception(res.text)
+            return self._request(
+                method,
+                url,
+                retry=False,
+                timeout=timeout,
+                headers=headers,
+                safe=safe,
+                **kwargs,
+            )
+        error = TransientError if res.status_code >= 500 else APIError
+        raise error(
+            res.text,
+            status=res.status_code,
+            method=method,
+            url=url,
+            latency=time.monotonic() - started,
+            attempts=attempts,
+        )
+
+    def get(self, url, retry=True, timeout=10, headers=None, **kwargs):
+        return self._request(
+            "GET", url, retry=retry, timeout=timeout, headers=headers, **kwargs
+        )
+
+    def post(self, url, retry=True, timeout=10, headers=None, safe=False, **kwargs):
+        """Set safe=True to let transient failures be retried for an idempotent POST"""
+        return self._request(
+            "POST",
+            url,
+            retry=retry,
+            timeout=timeout,
+            headers=headers,
+            safe=safe,
+            **kwargs,
+        )
 
     def delete(self, url, retry=True, timeout=10, headers=None, **kwargs):
-        res = self._session.delete(
-            url, timeout=timeout, headers=headers or self.account.headers, **kwargs
+        return self._request(
+            "DELETE", url, retry=retry, timeout=timeout, headers=headers, **kwargs
         )
-        if res.status_code == 200:
-            return res
-        if res.status_code == 401 and retry and self.account.token_location:
-            self.account.refresh_tokens()
-            self.account.update_auth_header()
-            return self.delete(
-                url, retry=False, timeout=timeout, headers=headers, **kwargs
-            )
-        raise Exception(res.text)
 
     def put(self, url, retry=True, timeout=10, headers=None, **kwargs):
-        res = self._session.put(
-            url, timeout=timeout, headers=headers or self.account.headers, **kwargs
+        return self._request(
+            "PUT", url, retry=retry, timeout=timeout, headers=headers, **kwargs
         )
-        if res.status_code == 200:
-            return res
-        if res.status_code == 401 and retry and self.account.token_location:
-            self.account.refresh_tokens()
-            self.account.update_auth_header()
-            return self.put(
-                url, retry=False, timeout=timeout, headers=headers, **kwargs
-            )
-        raise Exception(res.text)
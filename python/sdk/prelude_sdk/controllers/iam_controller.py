@@ -5,6 +5,7 @@ import os
 from prelude_sdk.controllers.http_controller import HttpController
 from prelude_sdk.models.account import verify_credentials
 from prelude_sdk.models.codes import Control, Mode, Permission
+from prelude_sdk.models.memo_cache import invalidates, memoize
 
 
 class IAMAccountController(HttpController):
@@ -13,6 +14,7 @@ class IAMAccountController(HttpController):
         super().__init__(account)
 
     @verify_credentials
+    @memoize("account", ttl=60)
     def get_account(self):
         """Get account properties"""
         res = self.get(f"{self.account.hq}/iam/account")
@@ -24,12 +26,14 @@ class IAMAccountController(HttpController):
         return account
 
     @verify_credentials
+    @invalidates("account")
     def purge_account(self):
         """Delete an account and all things in it"""
         res = self.delete(f"{self.account.hq}/iam/account")
         return res.json()
 
     @verify_credentials
+    @invalidates("account")
     def update_account(
         self,
         company: str = None,
@@ -52,6 +56,7 @@ class IAMAccountController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("account")
     def attach_oidc(
         self,
         client_id: str,
@@ -72,12 +77,14 @@ class IAMAccountController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("account")
     def detach_oidc(self):
         """Detach OIDC to an account"""
         res = self.delete(f"{self.account.hq}/iam/account/oidc")
         return res.json()
 
     @verify_credentials
+    @invalidates("account")
     def invite_user(
         self,
         email: str,
@@ -97,6 +104,7 @@ class IAMAccountController(HttpController):
         return user
 
     @verify_credentials
+    @invalidates("account")
     def create_service_user(self, name: str):
         """Create a service user"""
         body = dict(name=name)
@@ -105,6 +113,7 @@ class IAMAccountController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("account")
     def delete_service_user(self, handle: str):
         """Delete service user"""
         body = dict(handle=handle)
@@ -113,6 +122,7 @@ class IAMAccountController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("account")
     def update_account_user(
         self,
         email: str,
@@ -128,6 +138,7 @@ class IAMAccountController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("account")
     def remove_user(self, email: str, oidc: str | None):
         """Remove user from the account"""
         params = dict(handle=email, oidc=oidc)
@@ -185,12 +196,14 @@ class IAMUserController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("account")
     def purge_user(self):
         """Delete your user"""
         res = self.delete(f"{self.account.hq}/iam/user")
         return res.json()
 
     @verify_credentials
+    @invalidates("account")
     def update_user(
         self,
         name: str = None,
@@ -1,3 +1,5 @@
+import random
+import time
 from itertools import chain
 
 from prelude_sdk.controllers.http_controller import HttpController
@@ -5,6 +7,23 @@ from prelude_sdk.models.account import verify_credentials
 from prelude_sdk.models.codes import BackgroundJobTypes, Control
 
 
+def poll_until(
+    fetch, done, timeout: float = None, initial_delay: float = 1, max_delay: float = 10
+):
+    """
+    Call fetch() until done(result) is true, sleeping between calls with exponential
+    backoff and decorrelated jitter. Raises TimeoutError after timeout seconds.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = initial_delay
+    while not done(result := fetch()):
+        if deadline is not None and (remaining := deadline - time.monotonic()) <= 0:
+            raise TimeoutError(f"Timed out after {timeout} seconds")
+        time.sleep(delay if deadline is None else min(delay, remaining))
+        delay = min(max_delay, random.uniform(initial_delay, delay * 3))
+    return result
+
+
 class JobsController(HttpController):
 
     def __init__(self, account):
@@ -29,3 +48,60 @@ class JobsController(HttpController):
                 job, [(Control, "control"), (BackgroundJobTypes, "job_type")]
             )
         return job
+
+    def wait_for_job(
+        self,
+        job_id: str,
+        timeout: float = None,
+        initial_delay: float = 1,
+        max_delay: float = 10,
+    ):
+        """Poll a job until it ends and return its final status"""
+        return poll_until(
+            lambda: self.job_status(job_id),
+            lambda job: job["end_time"] is not None,
+            timeout=timeout,
+            initial_delay=initial_delay,
+            max_delay=max_delay,
+        )
+
+    def wait_for_jobs(
+        self,
+        job_ids: list[str],
+        timeout: float = None,
+        initial_delay: float = 1,
+        max_delay: float = 10,
+        on_complete=None,
+    ):
+        """
+        Wait for several jobs with a single job_statuses() call per poll, falling back
+        to job_status() for jobs not in the recent list. on_complete(job) is called as
+        each job ends; the final statuses are returned in job_ids order.
+        """
+        pending = set(job_ids)
+        finished = dict()
+
+        def poll():
+            jobs = {
+                job["id"]: job
+                for job in chain.from_iterable(self.job_statuses().values())
+                if job["id"] in pending
+            }
+            for job_id in pending - jobs.keys():
+                jobs[job_id] = self.job_status(job_id)
+            for job_id, job in jobs.items():
+                if job["end_time"] is not None:
+                    pending.discard(job_id)
+                    finished[job_id] = job
+                    if on_complete:
+                        on_complete(job)
+            return pending
+
+        poll_until(
+            poll,
+            lambda pending: not pending,
+            timeout=timeout,
+            initial_delay=initial_delay,
+            max_delay=max_delay,
+        )
+        return [finished[job_id] for job_id in job_ids]
@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from prelude_sdk.controllers.http_controller import HttpController
 from prelude_sdk.models.account import verify_credentials
 from prelude_sdk.models.codes import Control, ControlCategory
+from prelude_sdk.models.memo_cache import invalidates
 
 
 class PartnerController(HttpController):
@@ -11,6 +12,7 @@ class PartnerController(HttpController):
         super().__init__(account)
 
     @verify_credentials
+    @invalidates("account", "partner_groups", "technique_summary")
     def attach(
         self,
         partner: Control,
@@ -36,6 +38,7 @@ class PartnerController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("account", "partner_groups", "technique_summary")
     def detach(self, partner: Control, instance_id: str):
         """Detach a partner from your Detect account"""
         res = self.delete(
@@ -137,6 +140,7 @@ class PartnerController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("account", "partner_groups", "technique_summary")
     def attach_custom(
         self,
         config: dict,
@@ -1,3 +1,6 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 from prelude_sdk.controllers.http_controller import HttpController
 from prelude_sdk.models.account import verify_credentials
 from prelude_sdk.models.codes import (
@@ -9,6 +12,7 @@ from prelude_sdk.models.codes import (
     RunCode,
     SCMCategory,
 )
+from prelude_sdk.models.memo_cache import invalidates, memoize
 
 
 class ScmController(HttpController):
@@ -17,6 +21,52 @@ class ScmController(HttpController):
     def __init__(self, account):
         super().__init__(account)
 
+    @staticmethod
+    def _records(page):
+        return page["value"] if isinstance(page, dict) else page
+
+    def _iter_pages(self, fetch, page_size: int, skip: int, workers: int, **kwargs):
+        """
+        Lazily walk an OData listing in $skip order. The first page is fetched alone;
+        if it comes back short, one more request tells a server-side $top cap from the
+        end of the listing, and a cap becomes the page size. After that up to `workers`
+        pages are fetched concurrently ahead of the caller, so at most workers + 1
+        pages are held in memory, and fetching stops at the first short page.
+        """
+        records = self._records(fetch(top=page_size, skip=skip, **kwargs))
+        skip += len(records)
+        yield from records
+        if len(records) < page_size:
+            if not records:
+                return
+            page_size = len(records)
+            records = self._records(fetch(top=page_size, skip=skip, **kwargs))
+            skip += len(records)
+            yield from records
+            if len(records) < page_size:
+                return
+
+        self._reserve_connections(workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for _ in range(workers):
+                pending.append(
+                    executor.submit(fetch, top=page_size, skip=skip, **kwargs)
+                )
+                skip += page_size
+            while pending:
+                records = self._records(pending.popleft().result())
+                if len(records) < page_size:
+                    for future in pending:
+                        future.cancel()
+                    pending.clear()
+                else:
+                    pending.append(
+                        executor.submit(fetch, top=page_size, skip=skip, **kwargs)
+                    )
+                    skip += page_size
+                yield from records
+
     @verify_credentials
     def endpoints(
         self,
@@ -51,6 +101,31 @@ class ScmController(HttpController):
             )
         return data
 
+    def iter_endpoints(
+        self,
+        select: str = None,
+        filter: str = None,
+        orderby: str = None,
+        expand: str = None,
+        page_size: int = 1000,
+        skip: int = 0,
+        workers: int = 1,
+    ):
+        """
+        Iterate over all endpoints with SCM analysis, page by page. Raise workers to
+        fetch pages concurrently for a full inventory pull; order is preserved.
+        """
+        return self._iter_pages(
+            self.endpoints,
+            page_size,
+            skip,
+            workers,
+            select=select,
+            filter=filter,
+            orderby=orderby,
+            expand=expand,
+        )
+
     @verify_credentials
     def inboxes(
         self,
@@ -85,6 +160,31 @@ class ScmController(HttpController):
             )
         return data
 
+    def iter_inboxes(
+        self,
+        select: str = None,
+        filter: str = None,
+        orderby: str = None,
+        expand: str = None,
+        page_size: int = 1000,
+        skip: int = 0,
+        workers: int = 1,
+    ):
+        """
+        Iterate over all inboxes with SCM analysis, page by page. Raise workers to
+        fetch pages concurrently for a full inventory pull; order is preserved.
+        """
+        return self._iter_pages(
+            self.inboxes,
+            page_size,
+            skip,
+            workers,
+            select=select,
+            filter=filter,
+            orderby=orderby,
+            expand=expand,
+        )
+
     @verify_credentials
     def network_devices(
         self,
@@ -121,6 +221,31 @@ class ScmController(HttpController):
             )
         return data
 
+    def iter_network_devices(
+        self,
+        select: str = None,
+        filter: str = None,
+        orderby: str = None,
+        expand: str = None,
+        page_size: int = 1000,
+        skip: int = 0,
+        workers: int = 1,
+    ):
+        """
+        Iterate over all network devices with SCM analysis, page by page. Raise workers to
+        fetch pages concurrently for a full inventory pull; order is preserved.
+        """
+        return self._iter_pages(
+            self.network_devices,
+            page_size,
+            skip,
+            workers,
+            select=select,
+            filter=filter,
+            orderby=orderby,
+            expand=expand,
+        )
+
     @verify_credentials
     def users(
         self,
@@ -155,6 +280,31 @@ class ScmController(HttpController):
             )
         return data
 
+    def iter_users(
+        self,
+        select: str = None,
+        filter: str = None,
+        orderby: str = None,
+        expand: str = None,
+        page_size: int = 1000,
+        skip: int = 0,
+        workers: int = 1,
+    ):
+        """
+        Iterate over all users with SCM analysis, page by page. Raise workers to
+        fetch pages concurrently for a full inventory pull; order is preserved.
+        """
+        return self._iter_pages(
+            self.users,
+            page_size,
+            skip,
+            workers,
+            select=select,
+            filter=filter,
+            orderby=orderby,
+            expand=expand,
+        )
+
     @verify_credentials
     def software(
         self,
@@ -176,7 +326,31 @@ class ScmController(HttpController):
         res = self.get(f"{self.account.hq}/scm/software", params=params, timeout=30)
         return res.json()
 
+    def iter_software(
+        self,
+        select: str = None,
+        filter: str = None,
+        orderby: str = None,
+        page_size: int = 1000,
+        skip: int = 0,
+        workers: int = 1,
+    ):
+        """
+        Iterate over all software with SCM analysis, page by page. Raise workers to
+        fetch pages concurrently for a full inventory pull; order is preserved.
+        """
+        return self._iter_pages(
+            self.software,
+            page_size,
+            skip,
+            workers,
+            select=select,
+            filter=filter,
+            orderby=orderby,
+        )
+
     @verify_credentials
+    @memoize("technique_summary", ttl=60)
     def technique_summary(self, techniques: str):
         """Get policy evaluation summary by technique"""
         res = self.get(
@@ -240,6 +414,7 @@ class ScmController(HttpController):
         return data
 
     @verify_credentials
+    @invalidates("technique_summary")
     def update_evaluation(self, partner: Control, instance_id: str):
         """Update policy evaluations for given partner"""
         res = self.post(
@@ -248,6 +423,7 @@ class ScmController(HttpController):
         return res.json()
 
     @verify_credentials
+    @memoize("partner_groups", ttl=300)
     def list_partner_groups(self, filter: str = None, orderby: str = None):
         """List groups"""
         params = {"$filter": filter, "$orderby": orderby}
@@ -259,6 +435,7 @@ class ScmController(HttpController):
         return groups
 
     @verify_credentials
+    @invalidates("partner_groups", "technique_summary")
     def update_partner_groups(
         self, partner: Control, instance_id: str, group_ids: list[str]
     ):
@@ -280,6 +457,7 @@ class ScmController(HttpController):
         return exceptions
 
     @verify_credentials
+    @invalidates("technique_summary")
     def create_object_exception(
         self,
         category: ControlCategory,
@@ -301,6 +479,7 @@ class ScmController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("technique_summary")
     def update_object_exception(
         self, exception_id, comment=None, expires=default, filter=None, name=None
     ):
@@ -321,6 +500,7 @@ class ScmController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("technique_summary")
     def delete_object_exception(self, exception_id):
         """Delete an object exception"""
         res = self.delete(f"{self.account.hq}/scm/exceptions/objects/{exception_id}")
@@ -338,6 +518,7 @@ class ScmController(HttpController):
         return exceptions
 
     @verify_credentials
+    @invalidates("technique_summary")
     def create_policy_exception(
         self,
         partner: Control,
@@ -361,6 +542,7 @@ class ScmController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("technique_summary")
     def update_policy_exception(
         self,
         partner: Control,
@@ -383,6 +565,7 @@ class ScmController(HttpController):
         return res.json()
 
     @verify_credentials
+    @invalidates("technique_summary")
     def delete_policy_exception(self, instance_id: str, policy_id: str):
         """Delete policy exceptions"""
         body = dict(instance_id=instance_id, policy_id=policy_id)
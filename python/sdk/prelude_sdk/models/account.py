@@ -1,11 +1,36 @@
+import asyncio
+import base64
 import configparser
+import inspect
 import json
 import os
-from functools import wraps
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 from pathlib import Path
 
 import requests
 
+from prelude_sdk.models.circuit_breaker import CircuitBreaker
+from prelude_sdk.models.errors import APIError
+from prelude_sdk.models.instrumentation import Hooks
+from prelude_sdk.models.memo_cache import MemoCache
+from prelude_sdk.models.rate_limiter import RateLimiter, default_rate_limiter
+from prelude_sdk.models.response_cache import ResponseCache
+from prelude_sdk.models.retry_policy import RetryPolicy
+
+try:
+    import fcntl
+except ImportError:
+    import msvcrt
+
+    fcntl = None
+
+PRELUDE_TOKEN_REFRESH_MARGIN = int(os.getenv("PRELUDE_TOKEN_REFRESH_MARGIN", 60))
+PRELUDE_TOKEN_REFRESH_BACKOFF = int(os.getenv("PRELUDE_TOKEN_REFRESH_BACKOFF", 300))
+
 
 class Keychain:
 
@@ -73,17 +98,78 @@ def exchange_token(
         json=dict(auth_flow=auth_flow, handle=handle, **auth_params),
         timeout=10,
     )
-    if res.status_code == 401:
-        raise Exception("Error logging in: Unauthorized")
     if not res.ok:
-        raise Exception("Error logging in: %s" % res.text)
+        raise APIError(
+            "Error logging in: %s"
+            % ("Unauthorized" if res.status_code == 401 else res.text),
+            status=res.status_code,
+            method="POST",
+            url=res.url,
+        )
     return res.json()
 
 
+_token_file_locks = dict()
+_token_file_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _lock_token_file(token_location: str):
+    """
+    Hold an exclusive lock on a tokens file: a thread lock within this process plus
+    an advisory lock on a sidecar file, so other processes sharing the profile wait
+    for as long as the holder needs, however long its token exchange takes
+    """
+    path = os.path.realpath(token_location)
+    with _token_file_locks_guard:
+        thread_lock = _token_file_locks.setdefault(path, threading.Lock())
+    with thread_lock, open(f"{path}.lock", "a+") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@lru_cache(maxsize=32)
+def _token_expiry(token: str) -> float | None:
+    """Read the exp claim from a JWT access token, or None if it cannot be decoded"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
 class Account:
 
     @staticmethod
-    def from_keychain(profile: str = "default", resolve_enums: bool = False):
+    def from_keychain(
+        profile: str = "default",
+        resolve_enums: bool = False,
+        http_cache: ResponseCache | None = None,
+        memo_cache: MemoCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hooks: list[Hooks] | None = None,
+    ):
         """
         Create an account object from a pre-configured profile in your keychain file
         """
@@ -101,6 +187,12 @@ class Account:
             profile=profile,
             slug=profile_items.get("slug"),
             resolve_enums=resolve_enums,
+            http_cache=http_cache,
+            memo_cache=memo_cache,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            hooks=hooks,
         )
 
     @staticmethod
@@ -113,6 +205,12 @@ class Account:
         oidc: str | None = None,
         slug: str | None = None,
         resolve_enums: bool = False,
+        http_cache: ResponseCache | None = None,
+        memo_cache: MemoCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hooks: list[Hooks] | None = None,
     ):
         """
         Create an account object from an access token or a refresh token
@@ -134,6 +232,12 @@ class Account:
             token=token,
             token_location=None,
             resolve_enums=resolve_enums,
+            http_cache=http_cache,
+            memo_cache=memo_cache,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            hooks=hooks,
         )
 
 
@@ -155,6 +259,12 @@ class _Account:
             Path.home(), ".prelude", "tokens.json"
         ),
         resolve_enums: bool = False,
+        http_cache: ResponseCache | None = None,
+        memo_cache: MemoCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        hooks: list[Hooks] | None = None,
     ):
         if token is None and token_location is None:
             raise ValueError(
@@ -173,6 +283,15 @@ class _Account:
         self.token = token
         self.token_location = token_location
         self.resolve_enums = resolve_enums
+        self.http_cache = http_cache
+        self.memo_cache = memo_cache
+        self.rate_limiter = rate_limiter or default_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.hooks = hooks or []
+        self._tokens = None
+        self._tokens_stat = None
+        self._refresh_failed = None
         if self.token_location and not os.path.exists(self.token_location):
             head, _ = os.path.split(Path(self.token_location))
             Path(head).mkdir(parents=True, exist_ok=True)
@@ -184,17 +303,49 @@ class _Account:
     def token_key(self):
         return f"{self.handle}/{self.oidc}" if self.oidc else self.handle
 
+    @staticmethod
+    def _stamp(stat: os.stat_result):
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
     def _read_tokens(self):
-        with open(self.token_location, "r") as f:
-            return json.load(f)
+        """
+        Parse the token file, reusing the in-memory copy until the file changes. The
+        copy is stamped from the handle it was read through, so a file replaced
+        mid-read is never mistaken for the one parsed.
+        """
+        if self._tokens is None or (
+            self._stamp(os.stat(self.token_location)) != self._tokens_stat
+        ):
+            with open(self.token_location, "r") as f:
+                stamp = self._stamp(os.fstat(f.fileno()))
+                self._tokens = json.load(f)
+            self._tokens_stat = stamp
+        return self._tokens
 
     def save_new_token(self, new_tokens):
+        with _lock_token_file(self.token_location):
+            self._write_tokens(new_tokens)
+
+    def _write_tokens(self, new_tokens):
+        """Merge new tokens into the file and atomically replace it; hold the file lock"""
         existing_tokens = self._read_tokens()
-        if self.token_key not in existing_tokens:
-            existing_tokens[self.token_key] = dict()
-        existing_tokens[self.token_key][self.hq] = new_tokens
-        with open(self.token_location, "w") as f:
-            json.dump(existing_tokens, f)
+        existing_tokens = existing_tokens | {
+            self.token_key: existing_tokens.get(self.token_key, {})
+            | {self.hq: new_tokens}
+        }
+        head, tail = os.path.split(self.token_location)
+        fd, tmp = tempfile.mkstemp(dir=head, prefix=f".{tail}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(existing_tokens, f)
+                f.flush()
+                stamp = self._stamp(os.fstat(f.fileno()))
+            os.replace(tmp, self.token_location)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self._tokens = existing_tokens
+        self._tokens_stat = stamp
 
     def _verify(self):
         if not self.token_location:
@@ -216,20 +367,44 @@ class _Account:
         self.save_new_token(tokens)
         return tokens
 
-    def refresh_tokens(self):
+    def refresh_tokens(
+        self,
+        stale_token: str | None = None,
+        reason: str = "requested",
+        method: str | None = None,
+        route: str | None = None,
+    ):
+        """
+        Exchange the refresh token for a new access token. Refreshes are serialized
+        across threads and processes; if stale_token is given and another caller has
+        already replaced it, the stored tokens are returned without a new exchange.
+        Each exchange is reported to the hooks' on_refresh with reason, method and route.
+        """
         self._verify()
-        existing_tokens = self._read_tokens().get(self.token_key, {}).get(self.hq, {})
-        if not (refresh_token := existing_tokens.get("refresh_token")):
-            raise Exception("No refresh token found, please login first to continue")
-        tokens = exchange_token(
-            self.account,
-            self.handle,
-            self.hq,
-            "refresh",
-            dict(refresh_token=refresh_token, source=self.source),
-        )
-        tokens = existing_tokens | tokens
-        self.save_new_token(tokens)
+        with _lock_token_file(self.token_location):
+            existing_tokens = (
+                self._read_tokens().get(self.token_key, {}).get(self.hq, {})
+            )
+            if stale_token and existing_tokens.get("token", stale_token) != stale_token:
+                return existing_tokens
+            if not (refresh_token := existing_tokens.get("refresh_token")):
+                raise Exception(
+                    "No refresh token found, please login first to continue"
+                )
+            tokens = exchange_token(
+                self.account,
+                self.handle,
+                self.hq,
+                "refresh",
+                dict(refresh_token=refresh_token, source=self.source),
+            )
+            tokens = existing_tokens | tokens
+            self._write_tokens(tokens)
+        for hook in self.hooks:
+            try:
+                hook.on_refresh(method, route, reason)
+            except Exception:
+                pass
         return tokens
 
     def exchange_authorization_code(self, authorization_code: str, verifier: str):
@@ -253,17 +428,49 @@ class _Account:
         tokens = self._read_tokens().get(self.token_key, {}).get(self.hq, {})
         if "token" not in tokens:
             raise Exception("Please login to continue")
+        expiry = _token_expiry(tokens["token"])
+        if (
+            expiry
+            and "refresh_token" in tokens
+            and expiry - time.time() < PRELUDE_TOKEN_REFRESH_MARGIN
+            and not self._refresh_backing_off(tokens["token"])
+        ):
+            try:
+                return self.refresh_tokens(
+                    stale_token=tokens["token"], reason="expiring"
+                )["token"]
+            except (requests.RequestException, APIError):
+                self._refresh_failed = (tokens["token"], time.monotonic())
         return tokens["token"]
 
+    def _refresh_backing_off(self, token: str) -> bool:
+        """Whether a proactive refresh of this token failed recently enough to skip another"""
+        if not self._refresh_failed:
+            return False
+        failed_token, failed_at = self._refresh_failed
+        return (
+            failed_token == token
+            and time.monotonic() - failed_at < PRELUDE_TOKEN_REFRESH_BACKOFF
+        )
+
     def update_auth_header(self):
         self.headers |= dict(authorization=f"Bearer {self.get_token()}")
 
 
 def verify_credentials(func):
-    @wraps(verify_credentials)
-    def handler(*args, **kwargs):
-        args[0].account.update_auth_header()
-        return func(*args, **kwargs)
+    if inspect.iscoroutinefunction(func):
+
+        @wraps(verify_credentials)
+        async def handler(*args, **kwargs):
+            await asyncio.to_thread(args[0].account.update_auth_header)
+            return await func(*args, **kwargs)
+
+    else:
+
+        @wraps(verify_credentials)
+        def handler(*args, **kwargs):
+            args[0].account.update_auth_header()
+            return func(*args, **kwargs)
 
     handler.__wrapped__ = func
     return handler
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+
+class AttachmentCache:
+    """
+    Content-addressed store of test attachments. Blobs are kept once per sha256 and an
+    index maps (test_id, filename) to the blob plus the ETag / Last-Modified the server
+    reported, so later downloads can be revalidated instead of transferred again.
+    """
+
+    def __init__(
+        self,
+        directory: str = os.path.join(Path.home(), ".prelude", "cache", "tests"),
+    ):
+        self.directory = directory
+        self._index_location = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        Path(directory, "blobs").mkdir(parents=True, exist_ok=True)
+        try:
+            with open(self._index_location, "r") as f:
+                self._index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._index = dict()
+
+    def _blob(self, sha256: str):
+        return os.path.join(self.directory, "blobs", sha256[:2], sha256)
+
+    def get(self, test_id: str, filename: str) -> dict | None:
+        with self._lock:
+            entry = self._index.get(test_id, {}).get(filename)
+        if entry and os.path.exists(self._blob(entry["sha256"])):
+            return entry
+        return None
+
+    @staticmethod
+    def validators(entry: dict | None) -> dict:
+        """Conditional request headers for a cached entry"""
+        headers = dict()
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read(self, entry: dict) -> bytes:
+        with open(self._blob(entry["sha256"]), "rb") as f:
+            return f.read()
+
+    def put(
+        self,
+        test_id: str,
+        filename: str,
+        data: bytes,
+        etag: str = None,
+        last_modified: str = None,
+    ) -> bytes:
+        sha256 = hashlib.sha256(data).hexdigest()
+        blob = self._blob(sha256)
+        if not os.path.exists(blob):
+            Path(blob).parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=Path(blob).parent)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, blob)
+        with self._lock:
+            self._index.setdefault(test_id, dict())[filename] = dict(
+                sha256=sha256, etag=etag, last_modified=last_modified
+            )
+        return data
+
+    def save(self):
+        """Persist the index; call once after a batch of downloads"""
+        with self._lock:
+            fd, tmp = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._index, f)
+            os.replace(tmp, self._index_location)
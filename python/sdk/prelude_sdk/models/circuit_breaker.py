@@ -0,0 +1,113 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+from prelude_sdk.models.errors import CircuitOpenError
+
+
+class CircuitBreaker:
+    """
+    Per-route circuit breaker. A route is the first `route_depth` path segments of a
+    URL, e.g. /scm/evaluations. After failure_threshold consecutive transient failures
+    the route opens and requests to it fail fast with CircuitOpenError for `cooldown`
+    seconds; then up to half_open_probes requests are let through, and the route closes
+    again on the first success or reopens on a failure. A probe that has not reported
+    back within probe_timeout seconds is presumed lost and its slot handed to the next
+    caller.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 30,
+        half_open_probes: int = 1,
+        route_depth: int = 2,
+        probe_timeout: float = 60,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+        self.route_depth = route_depth
+        self.probe_timeout = probe_timeout
+        self._routes = dict()
+        self._lock = threading.Lock()
+
+    def route(self, url: str) -> str:
+        parts = urlsplit(url)
+        segments = [s for s in parts.path.split("/") if s][: self.route_depth]
+        return f"{parts.netloc}/{'/'.join(segments)}"
+
+    def _circuit(self, route: str) -> dict:
+        return self._routes.setdefault(
+            route, dict(state=self.CLOSED, failures=0, opened=0, probes=0, probed=0)
+        )
+
+    def before(self, method: str, url: str) -> str:
+        """Admit a request or raise CircuitOpenError; returns the route to report on"""
+        route = self.route(url)
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuit(route)
+            if circuit["state"] == self.OPEN:
+                if now - circuit["opened"] < self.cooldown:
+                    raise CircuitOpenError(
+                        f"Circuit open for {route} after {circuit['failures']} failures",
+                        method=method,
+                        url=url,
+                        attempts=0,
+                    )
+                circuit.update(state=self.HALF_OPEN, probes=0)
+            if circuit["state"] == self.HALF_OPEN:
+                if now - circuit["probed"] >= self.probe_timeout:
+                    circuit["probes"] = 0
+                if circuit["probes"] >= self.half_open_probes:
+                    raise CircuitOpenError(
+                        f"Circuit half-open for {route}, waiting on probe",
+                        method=method,
+                        url=url,
+                        attempts=0,
+                    )
+                circuit["probes"] += 1
+                circuit["probed"] = now
+        return route
+
+    def release(self, route: str):
+        """Hand back a probe slot for a request that failed client-side, without judging the route"""
+        with self._lock:
+            circuit = self._circuit(route)
+            if circuit["state"] == self.HALF_OPEN and circuit["probes"]:
+                circuit["probes"] -= 1
+
+    def record(self, route: str, success: bool):
+        with self._lock:
+            circuit = self._circuit(route)
+            if success:
+                circuit.update(state=self.CLOSED, failures=0, probes=0)
+                return
+            circuit["failures"] += 1
+            if (
+                circuit["state"] == self.HALF_OPEN
+                or circuit["failures"] >= self.failure_threshold
+            ):
+                circuit.update(state=self.OPEN, opened=time.monotonic(), probes=0)
+
+    def state(self) -> dict:
+        """Snapshot of every route seen: state, consecutive failures and seconds until a probe"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                route: dict(
+                    state=c["state"],
+                    failures=c["failures"],
+                    retry_in=(
+                        max(0, self.cooldown - (now - c["opened"]))
+                        if c["state"] == self.OPEN
+                        else 0
+                    ),
+                )
+                for route, c in self._routes.items()
+            }
@@ -1,6 +1,7 @@
 import logging
 
 from enum import Enum, EnumMeta
+from types import MappingProxyType
 
 
 class MissingItem(EnumMeta):
@@ -14,6 +15,17 @@ class MissingItem(EnumMeta):
                 return cls(name)
 
 
+def _reverse_mapping(mapping: dict):
+    """Invert a {key: [members]} mapping, keeping the first key that lists a member"""
+    return MappingProxyType(
+        {
+            member: key
+            for key, members in reversed(mapping.items())
+            for member in members
+        }
+    )
+
+
 class RunCode(Enum, metaclass=MissingItem):
     INVALID = -1
     DAILY = 1
@@ -92,10 +104,7 @@ class ExitCode(Enum):
 
     @property
     def state(self):
-        for k, v in State.mapping().items():
-            if self in v:
-                return k
-        return State.NONE
+        return _EXIT_CODE_STATES.get(self, State.NONE)
 
 
 class State(Enum):
@@ -200,17 +209,11 @@ class Control(Enum, metaclass=MissingItem):
 
     @property
     def control_category(self):
-        for k, v in ControlCategory.mapping().items():
-            if self in v:
-                return k
-        return ControlCategory.NONE
+        return _CONTROL_CATEGORIES.get(self, ControlCategory.NONE)
 
     @property
     def scm_category(self):
-        for k, v in SCMCategory.control_mapping().items():
-            if self in v:
-                return k
-        return SCMCategory.NONE
+        return _CONTROL_SCM_CATEGORIES.get(self, SCMCategory.NONE)
 
     @property
     def parent(self):
@@ -244,75 +247,7 @@ class Control(Enum, metaclass=MissingItem):
 
     @property
     def display_name(self):
-        match self:
-            case Control.CROWDSTRIKE:
-                return "CrowdStrike"
-            case Control.DEFENDER:
-                return "Microsoft Defender"
-            case Control.SPLUNK:
-                return "Splunk"
-            case Control.SENTINELONE:
-                return "SentinelOne"
-            case Control.VECTR:
-                return "VECTR"
-            case Control.S3:
-                return "Amazon S3"
-            case Control.INTUNE:
-                return "Microsoft Intune"
-            case Control.SERVICENOW:
-                return "ServiceNow"
-            case Control.OKTA:
-                return "Okta"
-            case Control.M365:
-                return "Microsoft 365"
-            case Control.ENTRA:
-                return "Microsoft Entra ID"
-            case Control.JAMF:
-                return "Jamf"
-            case Control.GMAIL:
-                return "Gmail"
-            case Control.GOOGLE_IDENTITY:
-                return "Google Cloud Identity Platform"
-            case Control.DEFENDER_DISCOVERY:
-                return "Microsoft Defender Discovery"
-            case Control.TENABLE:
-                return "Tenable"
-            case Control.EC2:
-                return "Amazon EC2"
-            case Control.AWS_SSM:
-                return "Amazon SSM"
-            case Control.AZURE_VM:
-                return "Azure VM"
-            case Control.GITHUB:
-                return "GitHub"
-            case Control.TENABLE_DISCOVERY:
-                return "Tenable Discovery"
-            case Control.QUALYS:
-                return "Qualys"
-            case Control.QUALYS_DISCOVERY:
-                return "Qualys Discovery"
-            case Control.RAPID7:
-                return "Rapid7"
-            case Control.RAPID7_DISCOVERY:
-                return "Rapid7 Discovery"
-            case Control.INTEL_INTUNE:
-                return "Intel"
-            case Control.CISCO_MERAKI:
-                return "Cisco Meraki"
-            case Control.CISCO_MERAKI_IDENTITY:
-                return "Cisco Meraki Identity"
-            case Control.CROWDSTRIKE_VULN:
-                return "CrowdStrike Vulnerability Management"
-            case Control.DEFENDER_VULN:
-                return "Microsoft Defender Vulnerability Management"
-            case Control.NETSKOPE:
-                return "Netskope"
-            case Control.CUSTOM:
-                return "Custom"
-            case Control.ANTHROPIC:
-                return "Anthropic"
-            case _:
-                return "Unknown Control"
+        return _CONTROL_DISPLAY_NAMES.get(self, "Unknown Control")
 
 
 class ControlCategory(Enum, metaclass=MissingItem):
@@ -338,10 +273,7 @@ class ControlCategory(Enum, metaclass=MissingItem):
 
     @property
     def scm_category(self):
-        for k, v in SCMCategory.category_mapping().items():
-            if self in v:
-                return k
-        return SCMCategory.NONE
+        return _CATEGORY_SCM_CATEGORIES.get(self, SCMCategory.NONE)
 
     @classmethod
     def mapping(cls):
@@ -390,35 +322,7 @@ class ControlCategory(Enum, metaclass=MissingItem):
 
     @property
     def display_name(self):
-        match self:
-            case ControlCategory.CLOUD:
-                return "Cloud"
-            case ControlCategory.EMAIL:
-                return "Email"
-            case ControlCategory.IDENTITY:
-                return "Identity Provider"
-            case ControlCategory.NETWORK:
-                return "Network"
-            case ControlCategory.XDR:
-                return "EDR"
-            case ControlCategory.ASSET_MANAGER:
-                return "Endpoint Management"
-            case ControlCategory.DISCOVERED_DEVICES:
-                return "Discovered Devices"
-            case ControlCategory.VULN_MANAGER:
-                return "Vulnerability Management"
-            case ControlCategory.SIEM:
-                return "SIEM"
-            case ControlCategory.PRIVATE_REPO:
-                return "Private Repository"
-            case ControlCategory.HARDWARE:
-                return "Client Hardware Security"
-            case ControlCategory.SASE:
-                return "Secure Access Service Edge"
-            case ControlCategory.AI_PROVIDER:
-                return "AI Provider"
-            case _:
-                return "Unknown Control Category"
+        return _CONTROL_CATEGORY_DISPLAY_NAMES.get(self, "Unknown Control Category")
 
 
 class SCMCategory(Enum, metaclass=MissingItem):
@@ -490,6 +394,70 @@ class SCMCategory(Enum, metaclass=MissingItem):
         }
 
 
+_CONTROL_DISPLAY_NAMES = MappingProxyType(
+    {
+        Control.CROWDSTRIKE: "CrowdStrike",
+        Control.DEFENDER: "Microsoft Defender",
+        Control.SPLUNK: "Splunk",
+        Control.SENTINELONE: "SentinelOne",
+        Control.VECTR: "VECTR",
+        Control.S3: "Amazon S3",
+        Control.INTUNE: "Microsoft Intune",
+        Control.SERVICENOW: "ServiceNow",
+        Control.OKTA: "Okta",
+        Control.M365: "Microsoft 365",
+        Control.ENTRA: "Microsoft Entra ID",
+        Control.JAMF: "Jamf",
+        Control.GMAIL: "Gmail",
+        Control.GOOGLE_IDENTITY: "Google Cloud Identity Platform",
+        Control.DEFENDER_DISCOVERY: "Microsoft Defender Discovery",
+        Control.TENABLE: "Tenable",
+        Control.EC2: "Amazon EC2",
+        Control.AWS_SSM: "Amazon SSM",
+        Control.AZURE_VM: "Azure VM",
+        Control.GITHUB: "GitHub",
+        Control.TENABLE_DISCOVERY: "Tenable Discovery",
+        Control.QUALYS: "Qualys",
+        Control.QUALYS_DISCOVERY: "Qualys Discovery",
+        Control.RAPID7: "Rapid7",
+        Control.RAPID7_DISCOVERY: "Rapid7 Discovery",
+        Control.INTEL_INTUNE: "Intel",
+        Control.CISCO_MERAKI: "Cisco Meraki",
+        Control.CISCO_MERAKI_IDENTITY: "Cisco Meraki Identity",
+        Control.CROWDSTRIKE_VULN: "CrowdStrike Vulnerability Management",
+        Control.DEFENDER_VULN: "Microsoft Defender Vulnerability Management",
+        Control.NETSKOPE: "Netskope",
+        Control.CUSTOM: "Custom",
+        Control.ANTHROPIC: "Anthropic",
+    }
+)
+
+
+_CONTROL_CATEGORY_DISPLAY_NAMES = MappingProxyType(
+    {
+        ControlCategory.CLOUD: "Cloud",
+        ControlCategory.EMAIL: "Email",
+        ControlCategory.IDENTITY: "Identity Provider",
+        ControlCategory.NETWORK: "Network",
+        ControlCategory.XDR: "EDR",
+        ControlCategory.ASSET_MANAGER: "Endpoint Management",
+        ControlCategory.DISCOVERED_DEVICES: "Discovered Devices",
+        ControlCategory.VULN_MANAGER: "Vulnerability Management",
+        ControlCategory.SIEM: "SIEM",
+        ControlCategory.PRIVATE_REPO: "Private Repository",
+        ControlCategory.HARDWARE: "Client Hardware Security",
+        ControlCategory.SASE: "Secure Access Service Edge",
+        ControlCategory.AI_PROVIDER: "AI Provider",
+    }
+)
+
+
+_EXIT_CODE_STATES = _reverse_mapping(State.mapping())
+_CONTROL_CATEGORIES = _reverse_mapping(ControlCategory.mapping())
+_CONTROL_SCM_CATEGORIES = _reverse_mapping(SCMCategory.control_mapping())
+_CATEGORY_SCM_CATEGORIES = _reverse_mapping(SCMCategory.category_mapping())
+
+
 class BackgroundJobTypes(Enum, metaclass=MissingItem):
     INVALID = -1
     UPDATE_SCM = 1
@@ -0,0 +1,30 @@
+class APIError(Exception):
+    """
+    A request the API answered with an error. The message is the response body, as
+    before; status, method, url, latency (seconds, all attempts) and attempts describe
+    the call. status is None when no response was received.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status: int = None,
+        method: str = None,
+        url: str = None,
+        latency: float = None,
+        attempts: int = 1,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.method = method
+        self.url = url
+        self.latency = latency
+        self.attempts = attempts
+
+
+class TransientError(APIError):
+    """A 5xx, timeout or connection failure that was still failing when retries ran out"""
+
+
+class CircuitOpenError(TransientError):
+    """Not sent: recent failures opened the circuit for this route"""
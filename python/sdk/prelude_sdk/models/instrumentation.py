@@ -0,0 +1,199 @@
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+_IDENTIFIER = re.compile(
+    r"^(?:[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}|[0-9a-f]{24,}|\d+)$",
+    re.IGNORECASE,
+)
+_EMBEDDED_UUID = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+
+def _template(segment: str, last: bool) -> str:
+    if _IDENTIFIER.match(segment):
+        return "{id}"
+    if last and "." in segment:
+        return "{file}"
+    return _EMBEDDED_UUID.sub("{id}", segment)
+
+
+def route_template(url: str) -> str:
+    """
+    URL path with identifier segments (UUIDs, long hex, numbers) replaced by {id},
+    UUIDs inside a segment by {id} and a trailing filename by {file}, so routes stay
+    few enough to label metrics with
+    """
+    segments = urlsplit(url).path.split("/")
+    last = len(segments) - 1
+    return "/".join(_template(s, i == last) for i, s in enumerate(segments)) or "/"
+
+
+class Hooks:
+    """
+    Base class for request instrumentation. Override any of the methods and pass
+    instances to the account as hooks=[...]; exceptions raised by a hook are ignored.
+    """
+
+    def before_request(self, method: str, route: str, attempt: int):
+        pass
+
+    def after_response(
+        self,
+        method: str,
+        route: str,
+        status: int | None,
+        sent: int,
+        received: int,
+        elapsed: float,
+        retries: int,
+    ):
+        """status is None when no response arrived; elapsed covers this attempt only"""
+        pass
+
+    def on_retry(
+        self, method: str, route: str, reason: str, attempt: int, delay: float
+    ):
+        pass
+
+    def on_refresh(self, method: str | None, route: str | None, reason: str):
+        """
+        An access token was exchanged: reason is "401" for a request the API rejected,
+        "expiring" ahead of expiry and "requested" for a direct call; method and route
+        name the rejected request and are None otherwise
+        """
+        pass
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsCollector(Hooks):
+    """In-memory latency histograms and byte/retry/refresh counters per method, route and status"""
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, buckets: tuple = BUCKETS, prefix: str = "prelude_sdk"):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._latency = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        self._latency_sum = defaultdict(float)
+        self._sent = defaultdict(int)
+        self._received = defaultdict(int)
+        self._retries = defaultdict(int)
+        self._refreshes = defaultdict(int)
+
+    def after_response(self, method, route, status, sent, received, elapsed, retries):
+        labels = (method, route, "error" if status is None else str(status))
+        with self._lock:
+            self._latency[labels][bisect_left(self.buckets, elapsed)] += 1
+            self._latency_sum[labels] += elapsed
+            self._sent[labels] += sent
+            self._received[labels] += received
+
+    def on_retry(self, method, route, reason, attempt, delay):
+        with self._lock:
+            self._retries[(method, route, reason)] += 1
+
+    def on_refresh(self, method, route, reason):
+        with self._lock:
+            self._refreshes[(method or "", route or "", reason)] += 1
+
+    def snapshot(self) -> dict:
+        """Per (method, route, status): request count, latency sum and bytes"""
+        with self._lock:
+            return {
+                labels: dict(
+                    count=sum(counts),
+                    seconds=self._latency_sum[labels],
+                    sent=self._sent[labels],
+                    received=self._received[labels],
+                )
+                for labels, counts in self._latency.items()
+            }
+
+    def prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        p = self.prefix
+        lines = []
+
+        def label(names, values, **extra):
+            pairs = list(zip(names, values)) + list(extra.items())
+            return ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+
+        keys = ("method", "route", "status")
+        with self._lock:
+            lines += [
+                f"# HELP {p}_request_duration_seconds Time per HTTP attempt",
+                f"# TYPE {p}_request_duration_seconds histogram",
+            ]
+            for labels, counts in sorted(self._latency.items()):
+                total = 0
+                for bound, count in zip(self.buckets + ("+Inf",), counts):
+                    total += count
+                    lines.append(
+                        f"{p}_request_duration_seconds_bucket{{{label(keys, labels, le=bound)}}} {total}"
+                    )
+                lines.append(
+                    f"{p}_request_duration_seconds_sum{{{label(keys, labels)}}} {self._latency_sum[labels]}"
+                )
+                lines.append(
+                    f"{p}_request_duration_seconds_count{{{label(keys, labels)}}} {total}"
+                )
+            for name, help, series, names in (
+                ("request_bytes_total", "Request body bytes sent", self._sent, keys),
+                (
+                    "response_bytes_total",
+                    "Response body bytes received",
+                    self._received,
+                    keys,
+                ),
+                (
+                    "retries_total",
+                    "Requests resent",
+                    self._retries,
+                    ("method", "route", "reason"),
+                ),
+                (
+                    "token_refreshes_total",
+                    "Access token refreshes",
+                    self._refreshes,
+                    ("method", "route", "reason"),
+                ),
+            ):
+                lines += [f"# HELP {p}_{name} {help}", f"# TYPE {p}_{name} counter"]
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{p}_{name}{{{label(names, labels)}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def serve_prometheus(
+    collector: MetricsCollector, port: int = 9464, host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """Serve collector.prometheus() at /metrics from a daemon thread; call shutdown() to stop"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = collector.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,142 @@
+import copy
+import inspect
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from functools import wraps
+
+
+class MemoCache:
+    """
+    Bounded, in-process LRU of read-only controller results. Entries expire after the
+    TTL given to @memoize and are dropped when a method decorated with @invalidates
+    touches the same scope through an account sharing this cache.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = defaultdict(int)
+        self._misses = defaultdict(int)
+
+    def get(self, key: tuple):
+        """Return (True, value) for a live entry, otherwise (False, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits[key[1]] += 1
+                return True, copy.deepcopy(entry[1])
+            if entry:
+                del self._entries[key]
+            self._misses[key[1]] += 1
+            return False, None
+
+    def put(self, key: tuple, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *scopes: str):
+        """Drop entries in the given scopes, or everything when none are given"""
+        with self._lock:
+            if not scopes:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] in scopes]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        """Hit and miss counts per memoized method"""
+        with self._lock:
+            return {
+                name: dict(hits=self._hits[name], misses=self._misses[name])
+                for name in sorted(self._hits.keys() | self._misses.keys())
+            }
+
+
+def memoize(scope: str, ttl: float = 60):
+    """Serve a controller method from account.memo_cache, when one is configured"""
+
+    def decorator(func):
+        def key(self, args, kwargs):
+            return (
+                scope,
+                func.__qualname__,
+                self.account.account,
+                args,
+                tuple(sorted(kwargs.items())),
+            )
+
+        def lookup(cache, key):
+            """(found, value), with found None when the arguments can't be a key"""
+            try:
+                return cache.get(key)
+            except TypeError:
+                return None, None
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def handler(self, *args, **kwargs):
+                if (cache := self.account.memo_cache) is None:
+                    return await func(self, *args, **kwargs)
+                found, value = lookup(cache, entry := key(self, args, kwargs))
+                if found:
+                    return value
+                value = await func(self, *args, **kwargs)
+                if found is not None:
+                    cache.put(entry, value, ttl)
+                return value
+
+            return handler
+
+        @wraps(func)
+        def handler(self, *args, **kwargs):
+            if (cache := self.account.memo_cache) is None:
+                return func(self, *args, **kwargs)
+            found, value = lookup(cache, entry := key(self, args, kwargs))
+            if found:
+                return value
+            value = func(self, *args, **kwargs)
+            if found is not None:
+                cache.put(entry, value, ttl)
+            return value
+
+        return handler
+
+    return decorator
+
+
+def invalidates(*scopes: str):
+    """Clear the given memoized scopes after a mutating controller method, even if it fails"""
+
+    def decorator(func):
+        def invalidate(self):
+            if self.account.memo_cache is not None:
+                self.account.memo_cache.invalidate(*scopes)
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def handler(self, *args, **kwargs):
+                try:
+                    return await func(self, *args, **kwargs)
+                finally:
+                    invalidate(self)
+
+            return handler
+
+        @wraps(func)
+        def handler(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                invalidate(self)
+
+        return handler
+
+    return decorator
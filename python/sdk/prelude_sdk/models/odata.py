@@ -0,0 +1,311 @@
+import functools
+import re
+from datetime import datetime, timezone
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>'(?:[^']|'')*')
+        |(?P<datetime>\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:\d{2})?)?)
+        |(?P<number>-?\d+(?:\.\d+)?)
+        |(?P<name>[A-Za-z_$][A-Za-z0-9_.$]*)
+        |(?P<punct>[()/,:])
+    )""",
+    re.VERBOSE,
+)
+
+_COMPARISONS = {
+    "eq": lambda a, b: a == b,
+    "ne": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and b is not None and a > b,
+    "ge": lambda a, b: a is not None and b is not None and a >= b,
+    "lt": lambda a, b: a is not None and b is not None and a < b,
+    "le": lambda a, b: a is not None and b is not None and a <= b,
+}
+
+
+def _strings(func):
+    return lambda s, *args: None if s is None else func(s, *args)
+
+
+_FUNCTIONS = {
+    "contains": _strings(lambda s, sub: sub in s),
+    "startswith": _strings(lambda s, prefix: s.startswith(prefix)),
+    "endswith": _strings(lambda s, suffix: s.endswith(suffix)),
+    "indexof": _strings(lambda s, sub: s.find(sub)),
+    "length": _strings(len),
+    "tolower": _strings(str.lower),
+    "toupper": _strings(str.upper),
+    "trim": _strings(str.strip),
+    "concat": lambda a, b: None if a is None or b is None else f"{a}{b}",
+}
+
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+def _datetime(value):
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _compare(op, left, right):
+    def compare(record, scope):
+        a, b = left(record, scope), right(record, scope)
+        if isinstance(a, datetime) or isinstance(b, datetime):
+            a, b = _datetime(a), _datetime(b)
+        try:
+            return op(a, b)
+        except TypeError:
+            return False
+
+    return compare
+
+
+def _path(segments):
+    """Resolve a/b/c against the record, or against a lambda variable bound in scope"""
+
+    def resolve(record, scope):
+        value, path = record, segments
+        if segments[0] in scope:
+            value, path = scope[segments[0]], segments[1:]
+        for segment in path:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(segment)
+        return value
+
+    return resolve
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = []
+        position = 0
+        while position < len(text.rstrip()):
+            match = _TOKEN.match(text, position)
+            if not match:
+                raise ValueError(
+                    f"Invalid OData expression, unexpected {text[position:].split()[0]!r}: {text}"
+                )
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind)))
+            position = match.end()
+        self.position = 0
+
+    def peek(self, value=None):
+        if self.position >= len(self.tokens):
+            return None
+        kind, token = self.tokens[self.position]
+        if value is None or (token.lower() if kind == "name" else token) == value:
+            return kind, token
+        return None
+
+    def take(self, value=None):
+        token = self.peek(value)
+        if token is None:
+            raise ValueError(
+                f"Invalid OData expression, expected {value or 'a term'}: {self.text}"
+            )
+        self.position += 1
+        return token[1]
+
+    def done(self):
+        if self.position != len(self.tokens):
+            raise ValueError(
+                f"Invalid OData expression, unexpected {self.tokens[self.position][1]!r}: {self.text}"
+            )
+
+    def expression(self):
+        terms = [self.conjunction()]
+        while self.peek("or"):
+            self.take()
+            terms.append(self.conjunction())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda record, scope: any(term(record, scope) for term in terms)
+
+    def conjunction(self):
+        terms = [self.negation()]
+        while self.peek("and"):
+            self.take()
+            terms.append(self.negation())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda record, scope: all(term(record, scope) for term in terms)
+
+    def negation(self):
+        if self.peek("not"):
+            self.take()
+            term = self.negation()
+            return lambda record, scope: not term(record, scope)
+        return self.comparison()
+
+    def comparison(self):
+        left = self.operand()
+        token = self.peek()
+        if token and token[0] == "name" and token[1].lower() in _COMPARISONS:
+            op = _COMPARISONS[self.take().lower()]
+            return _compare(op, left, self.operand())
+        if self.peek("in"):
+            self.take()
+            self.take("(")
+            options = [self.operand()]
+            while self.peek(","):
+                self.take()
+                options.append(self.operand())
+            self.take(")")
+            return lambda record, scope: any(
+                _compare(_COMPARISONS["eq"], left, option)(record, scope)
+                for option in options
+            )
+        return left
+
+    def operand(self):
+        if self.peek("("):
+            self.take()
+            term = self.expression()
+            self.take(")")
+            return term
+        if not self.peek():
+            self.take()
+        kind, token = self.tokens[self.position]
+        self.position += 1
+        if kind == "string":
+            value = token[1:-1].replace("''", "'")
+            return lambda record, scope: value
+        if kind == "number":
+            value = float(token) if "." in token else int(token)
+            return lambda record, scope: value
+        if kind == "datetime":
+            value = _datetime(token if "T" in token else f"{token}T00:00:00")
+            return lambda record, scope: value
+        if kind != "name":
+            raise ValueError(f"Invalid OData expression, unexpected {token!r}")
+        if token.lower() in _LITERALS:
+            value = _LITERALS[token.lower()]
+            return lambda record, scope: value
+        if token.lower() in _FUNCTIONS and self.peek("("):
+            return self.function(_FUNCTIONS[token.lower()])
+        return self.member(token)
+
+    def function(self, func):
+        self.take("(")
+        args = [self.operand()]
+        while self.peek(","):
+            self.take()
+            args.append(self.operand())
+        self.take(")")
+        return lambda record, scope: func(*(arg(record, scope) for arg in args))
+
+    def member(self, first):
+        segments = [first]
+        while self.peek("/"):
+            self.take()
+            segment = self.take()
+            if segment.lower() in ("any", "all") and self.peek("("):
+                quantifier = any if segment.lower() == "any" else all
+                return self.lambda_(_path(segments), quantifier)
+            segments.append(segment)
+        return _path(segments)
+
+    def lambda_(self, collection, quantifier):
+        self.take("(")
+        if self.peek(")"):
+            self.take()
+            return lambda record, scope: bool(collection(record, scope))
+        variable = self.take()
+        self.take(":")
+        predicate = self.expression()
+        self.take(")")
+
+        def evaluate(record, scope):
+            items = collection(record, scope) or []
+            return quantifier(
+                predicate(record, {**scope, variable: item}) for item in items
+            )
+
+        return evaluate
+
+
+@functools.lru_cache(maxsize=256)
+def compile_filter(expression: str):
+    """Compile an OData $filter string into a predicate over a record dict"""
+    parser = _Parser(expression)
+    predicate = parser.expression()
+    parser.done()
+    return lambda record: bool(predicate(record, {}))
+
+
+@functools.lru_cache(maxsize=256)
+def compile_orderby(expression: str) -> list:
+    """Compile an OData $orderby string into (key, descending) pairs"""
+    keys = []
+    for clause in expression.split(","):
+        field, *direction = clause.split()
+        direction = direction[0].lower() if direction else "asc"
+        if len(clause.split()) > 2 or direction not in ("asc", "desc"):
+            raise ValueError(f"Invalid OData $orderby: {expression}")
+        path = _path(field.split("/"))
+
+        def key(record, path=path):
+            value = path(record, {})
+            return value is not None, value
+
+        keys.append((key, direction == "desc"))
+    return keys
+
+
+def _selection(paths: list[list[str]]) -> dict:
+    """Merge select paths into a tree; None marks a field selected whole"""
+    tree = dict()
+    for path in paths:
+        node = tree
+        for segment in path[:-1]:
+            if segment in node and node[segment] is None:
+                break
+            node = node.setdefault(segment, dict())
+        else:
+            node[path[-1]] = None
+    return tree
+
+
+def _select(value, tree: dict | None):
+    """Project a record onto a selection tree, mapping the rest of a path over lists"""
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_select(item, tree) for item in value]
+    if not isinstance(value, dict):
+        value = dict()
+    return {segment: _select(value.get(segment), sub) for segment, sub in tree.items()}
+
+
+def apply(
+    records,
+    filter: str = None,
+    orderby: str = None,
+    select: str = None,
+    top: int = None,
+    skip: int = None,
+) -> list[dict]:
+    """Evaluate $filter, $orderby, $skip, $top and $select over records, like the API would"""
+    if filter:
+        predicate = compile_filter(filter)
+        records = (record for record in records if predicate(record))
+    records = list(records)
+    if orderby:
+        for key, descending in reversed(compile_orderby(orderby)):
+            records.sort(key=key, reverse=descending)
+    records = records[skip or 0 :]
+    if top is not None:
+        records = records[:top]
+    if select:
+        tree = _selection([field.strip().split("/") for field in select.split(",")])
+        records = [_select(record, tree) for record in records]
+    return records
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+PRELUDE_RATE_LIMIT = float(os.getenv("PRELUDE_RATE_LIMIT", 0))
+PRELUDE_RATE_BURST = int(os.getenv("PRELUDE_RATE_BURST", 0))
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every controller of an account. Tokens refill at `rate` per
+    second up to `burst`; a Retry-After header or an exhausted rate-limit window pauses
+    every caller until the server is ready again. Given a state_location, the bucket is
+    kept in that file under an advisory lock so processes on one host pace together.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = None,
+        max_retries: int = 5,
+        state_location: str = None,
+    ):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.max_retries = max_retries
+        self.state_location = state_location
+        self.requests = 0
+        self.throttled = 0.0
+        self._lock = threading.Lock()
+        self._state = dict(tokens=self.burst, updated=time.time(), paused_until=0)
+
+    @contextmanager
+    def _bucket(self):
+        with self._lock:
+            if not self.state_location:
+                yield self._state
+                return
+            with open(self.state_location, "a+") as f:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                f.seek(0)
+                try:
+                    state = json.loads(f.read())
+                except ValueError:
+                    state = dict(self._state)
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+
+    def _take(self) -> float:
+        """Take a token if one is free; otherwise return how long to wait for one"""
+        with self._bucket() as state:
+            now = time.time()
+            state["tokens"] = min(
+                self.burst, state["tokens"] + (now - state["updated"]) * self.rate
+            )
+            state["updated"] = now
+            if state["paused_until"] > now:
+                return state["paused_until"] - now
+            if state["tokens"] >= 1:
+                state["tokens"] -= 1
+                return 0
+            return (1 - state["tokens"]) / self.rate
+
+    def _count(self, waited: float) -> float:
+        with self._lock:
+            self.requests += 1
+            self.throttled += waited
+        return waited
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds spent waiting"""
+        waited = 0.0
+        while delay := self._take():
+            time.sleep(delay)
+            waited += delay
+        return self._count(waited)
+
+    async def acquire_async(self) -> float:
+        """acquire() for an event loop: waits without blocking other tasks"""
+        waited = 0.0
+        while delay := self._take():
+            await asyncio.sleep(delay)
+            waited += delay
+        return self._count(waited)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for the given number of seconds"""
+        with self._bucket() as state:
+            state["paused_until"] = max(state["paused_until"], time.time() + seconds)
+            state["tokens"] = min(state["tokens"], 0)
+
+    @staticmethod
+    def _seconds(value: str | None) -> float | None:
+        """Parse a delta-seconds, epoch or HTTP-date header into seconds from now"""
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+            return seconds - time.time() if seconds > 1e9 else seconds
+        except ValueError:
+            pass
+        try:
+            return parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+
+    def update(self, res) -> float:
+        """Apply the server's Retry-After or rate-limit headers; returns the pause imposed"""
+        headers = res.headers
+        delay = self._seconds(headers.get("Retry-After"))
+        remaining = headers.get(
+            "X-RateLimit-Remaining", headers.get("RateLimit-Remaining")
+        )
+        if delay is None and remaining is not None and remaining.strip() == "0":
+            delay = self._seconds(
+                headers.get("X-RateLimit-Reset", headers.get("RateLimit-Reset"))
+            )
+        if delay is None and res.status_code == 429:
+            delay = 1 / self.rate
+        if delay and delay > 0:
+            self.pause(delay)
+            return delay
+        return 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(requests=self.requests, throttled_seconds=self.throttled)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_rate_limiter() -> RateLimiter | None:
+    """Process-wide limiter configured by PRELUDE_RATE_LIMIT, if set"""
+    global _default
+    if PRELUDE_RATE_LIMIT <= 0:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = RateLimiter(PRELUDE_RATE_LIMIT, burst=PRELUDE_RATE_BURST or None)
+        return _default
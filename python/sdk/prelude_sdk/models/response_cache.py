@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import requests
+
+
+class ResponseCache:
+    """
+    On-disk store of GET responses that carried an ETag or Last-Modified validator.
+    Entries are keyed by account, URL and query parameters and are revalidated with
+    a conditional request; a 304 is answered from the stored body.
+    """
+
+    def __init__(
+        self,
+        directory: str = os.path.join(Path.home(), ".prelude", "cache", "http"),
+    ):
+        self.directory = directory
+        Path(directory).mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(account: str, url: str, params: dict = None) -> str:
+        params = sorted((k, v) for k, v in (params or {}).items() if v is not None)
+        return hashlib.sha256(
+            json.dumps([account, url, params], default=str).encode("utf-8")
+        ).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.entry")
+
+    def _read(self, key: str, body: bool = True) -> tuple[dict, bytes | None] | None:
+        """An entry is one file: a JSON metadata line followed by the response body"""
+        try:
+            with open(self._path(key), "rb") as f:
+                meta = json.loads(f.readline())
+                return meta, f.read() if body else None
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def validators(self, key: str) -> dict:
+        """Conditional request headers for a cached response, if there is one"""
+        headers = dict()
+        if entry := self._read(key, body=False):
+            meta, _ = entry
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, key: str) -> requests.Response | None:
+        if not (entry := self._read(key)):
+            return None
+        meta, content = entry
+        res = requests.Response()
+        res.status_code = 200
+        res.url = meta["url"]
+        res.encoding = meta["encoding"]
+        res.headers.update(meta["headers"])
+        res._content = content
+        return res
+
+    def store(self, key: str, res: requests.Response):
+        etag = res.headers.get("ETag")
+        last_modified = res.headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        meta = dict(
+            etag=etag,
+            last_modified=last_modified,
+            url=str(res.url),
+            encoding=res.encoding,
+            headers={
+                k: v
+                for k, v in res.headers.items()
+                if k.lower() in ("content-type", "etag", "last-modified")
+            },
+        )
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(meta).encode("utf-8") + b"\n")
+                f.write(res.content)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.remove(tmp)
+            raise
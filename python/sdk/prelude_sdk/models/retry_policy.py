@@ -0,0 +1,59 @@
+import os
+import random
+import threading
+
+PRELUDE_RETRY_TOTAL = int(os.getenv("PRELUDE_RETRY_TOTAL", 3))
+PRELUDE_RETRY_BASE_DELAY = float(os.getenv("PRELUDE_RETRY_BASE_DELAY", 0.5))
+PRELUDE_RETRY_MAX_DELAY = float(os.getenv("PRELUDE_RETRY_MAX_DELAY", 10))
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before resending a request that failed transiently.
+    GET, PUT and DELETE are retried; POST only when the caller marks it safe. Delays
+    use decorrelated jitter. A retry budget shared by every controller of the account
+    allows `budget_ratio` retries per request (plus a small reserve), so an outage
+    does not multiply traffic.
+    """
+
+    IDEMPOTENT = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+    def __init__(
+        self,
+        total: int = PRELUDE_RETRY_TOTAL,
+        base_delay: float = PRELUDE_RETRY_BASE_DELAY,
+        max_delay: float = PRELUDE_RETRY_MAX_DELAY,
+        statuses: frozenset = frozenset([500, 502, 503, 504]),
+        budget_ratio: float = 0.2,
+        budget_reserve: int = 10,
+    ):
+        self.total = total
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = statuses
+        self.budget_ratio = budget_ratio
+        self.budget_reserve = budget_reserve
+        self.retries = 0
+        self._budget = float(budget_reserve)
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self._budget = min(self._budget + self.budget_ratio, self.budget_reserve)
+
+    def allows(self, method: str, attempt: int, safe: bool = False) -> bool:
+        """Whether attempt (1-based) may be followed by another; spends budget if so"""
+        if attempt > self.total or not (safe or method.upper() in self.IDEMPOTENT):
+            return False
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            self.retries += 1
+            return True
+
+    def backoff(self, previous: float = 0) -> float:
+        return min(
+            self.max_delay,
+            random.uniform(self.base_delay, max(self.base_delay, previous * 3)),
+        )
@@ -0,0 +1,181 @@
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+from prelude_sdk.models import odata
+from prelude_sdk.models.codes import SCMCategory
+
+
+class ScmMirror:
+    """
+    Local SQLite copy of the SCM inventory. Each category is bulk-loaded once;
+    afterwards a sync asks list_history which categories changed since their watermark
+    and, for those only, fetches the records whose modified_field is at or after it and
+    upserts them, so repeated filtering runs against the local database. Records
+    deleted upstream are only dropped by sync(full=True).
+
+    Example:
+        mirror = ScmMirror(ScmController(account), indexes=dict(endpoints=["hostname"]))
+        mirror.sync()
+        mirror.query("endpoints", "json_extract(data, '$.hostname') = ?", ("host-1",))
+        mirror.odata("endpoints", filter="contains(hostname, 'web')", top=10)
+    """
+
+    TABLES = {
+        SCMCategory.ENDPOINT: ("endpoints", "iter_endpoints"),
+        SCMCategory.INBOX: ("inboxes", "iter_inboxes"),
+        SCMCategory.USER: ("users", "iter_users"),
+        SCMCategory.NETWORK_DEVICE: ("network_devices", "iter_network_devices"),
+    }
+
+    def __init__(
+        self,
+        controller,
+        location: str = None,
+        indexes: dict[str, list[str]] = None,
+        page_size: int = 1000,
+        workers: int = 4,
+        modified_field: str = "updated",
+    ):
+        self.controller = controller
+        self.location = location or os.path.join(
+            Path.home(), ".prelude", "cache", f"scm-{controller.account.account}.db"
+        )
+        self.page_size = page_size
+        self.workers = workers
+        self.modified_field = modified_field
+        Path(self.location).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.location)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sync (name TEXT PRIMARY KEY, synced TEXT)"
+            )
+            for table, _ in self.TABLES.values():
+                self._db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+                )
+            for table, fields in (indexes or {}).items():
+                for field in fields:
+                    self._db.execute(
+                        f"CREATE INDEX IF NOT EXISTS {table}_{field.replace('.', '_')} "
+                        f"ON {table} (json_extract(data, '$.{field}'))"
+                    )
+
+    def close(self):
+        self._db.close()
+
+    def watermarks(self) -> dict:
+        """Time of the last sync of each table"""
+        return dict(self._db.execute("SELECT name, synced FROM sync"))
+
+    def _changed(self, watermarks: dict) -> set[str]:
+        """Tables with history events since their watermark; every table for an uncategorized event"""
+        tables = {table for table, _ in self.TABLES.values()}
+        if not watermarks.keys() & tables:
+            return set()
+        changed = set()
+        for event in self.controller.list_history(start_date=min(watermarks.values())):
+            if event.get("category") is None:
+                return tables
+            category = SCMCategory[event["category"]]
+            if category in self.TABLES:
+                changed.add(self.TABLES[category][0])
+        return changed
+
+    def _load(self, table: str, iterate: str, synced: str, since: str = None) -> int:
+        """Stream records into the table; without `since` the table is replaced wholesale"""
+        records = getattr(self.controller, iterate)(
+            filter=f"{self.modified_field} ge {since}" if since else None,
+            page_size=self.page_size,
+            workers=self.workers,
+        )
+        loaded = 0
+
+        def rows():
+            nonlocal loaded
+            for record in records:
+                loaded += 1
+                yield record["id"], json.dumps(record)
+
+        with self._db:
+            if not since:
+                self._db.execute(f"DELETE FROM {table}")
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {table} VALUES (?, ?)", rows()
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync VALUES (?, ?)", (table, synced)
+            )
+        return loaded
+
+    def sync(self, full: bool = False) -> dict:
+        """
+        Bulk-load tables never synced (all of them if full) and upsert records modified
+        since the watermark of tables with history events; returns rows written per table
+        """
+        synced = datetime.now(timezone.utc).isoformat()
+        watermarks = {} if full else self.watermarks()
+        changed = self._changed(watermarks)
+        loaded = dict()
+        for table, iterate in self.TABLES.values():
+            if table not in watermarks:
+                loaded[table] = self._load(table, iterate, synced)
+            elif table in changed:
+                loaded[table] = self._load(table, iterate, synced, watermarks[table])
+            else:
+                loaded[table] = 0
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO sync VALUES (?, ?)", (table, synced)
+                    )
+        return loaded
+
+    def get(self, table: str, id: str) -> dict | None:
+        row = self._db.execute(
+            f"SELECT data FROM {table} WHERE id = ?", (id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(
+        self,
+        table: str,
+        where: str = None,
+        params: tuple = (),
+        order_by: str = None,
+        limit: int = None,
+    ) -> list[dict]:
+        """Run a SQL filter over a table; fields are reached with json_extract(data, '$.field')"""
+        sql = f"SELECT data FROM {table}"
+        if where:
+            sql += f" WHERE {where}"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [json.loads(row[0]) for row in self._db.execute(sql, params)]
+
+    def records(self, table: str):
+        """Iterate over every record in a table"""
+        for (data,) in self._db.execute(f"SELECT data FROM {table}"):
+            yield json.loads(data)
+
+    def odata(
+        self,
+        table: str,
+        filter: str = None,
+        orderby: str = None,
+        select: str = None,
+        top: int = None,
+        skip: int = None,
+    ) -> list[dict]:
+        """Evaluate the same OData options the API accepts against a table"""
+        return odata.apply(
+            self.records(table),
+            filter=filter,
+            orderby=orderby,
+            select=select,
+            top=top,
+            skip=skip,
+        )
@@ -57,6 +57,12 @@ def pytest_addoption(parser):
     parser.addoption(
         "--manual", action="store_true", default=False, help="Enable manual tests"
     )
+    parser.addoption(
+        "--timing",
+        action="store_true",
+        default=False,
+        help="Enable wall-clock performance tests",
+    )
     parser.addoption(
         "--sdk_token",
         action="store",
@@ -89,6 +95,11 @@ def manual(pytestconfig):
     return pytestconfig.getoption("manual")
 
 
+@pytest.fixture(scope="session")
+def timing(pytestconfig):
+    return pytestconfig.getoption("timing")
+
+
 @pytest.fixture(scope="session")
 def existing_account(pytestconfig):
     if (account_id := pytestconfig.getoption("account_id")) and (
@@ -0,0 +1,178 @@
+import base64
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from prelude_sdk.models import account as account_module
+from prelude_sdk.models.account import _Account
+from prelude_sdk.models.errors import APIError
+from prelude_sdk.models.instrumentation import MetricsCollector
+
+
+def jwt(expires_in: float) -> str:
+    claims = json.dumps(dict(exp=time.time() + expires_in)).encode("utf-8")
+    payload = base64.urlsafe_b64encode(claims).decode("utf-8").rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def token_file(path, token, refresh_token="refresh"):
+    path.write_text(
+        json.dumps(
+            {
+                "user": {
+                    "https://api.test": dict(token=token, refresh_token=refresh_token)
+                }
+            }
+        )
+    )
+    return str(path)
+
+
+def new_account(token_location):
+    return _Account(
+        "account",
+        "user",
+        "https://api.test",
+        keychain_location=None,
+        token_location=token_location,
+    )
+
+
+class TestTokenRefresh:
+    def test_refreshes_ahead_of_expiry(self, tmp_path, monkeypatch):
+        fresh = jwt(3600)
+        exchanges = []
+        monkeypatch.setattr(
+            account_module,
+            "exchange_token",
+            lambda *args: exchanges.append(args) or dict(token=fresh),
+        )
+        account = new_account(token_file(tmp_path / "tokens.json", jwt(10)))
+
+        assert account.get_token() == fresh
+        assert account.get_token() == fresh
+        assert len(exchanges) == 1
+
+    def test_failed_refresh_backs_off(self, tmp_path, monkeypatch):
+        exchanges = []
+
+        def exchange_token(*args):
+            exchanges.append(args)
+            raise APIError("Error logging in: Unauthorized", status=401)
+
+        monkeypatch.setattr(account_module, "exchange_token", exchange_token)
+        stale = jwt(10)
+        location = token_file(tmp_path / "tokens.json", stale)
+        account = new_account(location)
+
+        for _ in range(5):
+            assert account.get_token() == stale
+        assert len(exchanges) == 1
+
+        replaced = jwt(20)
+        token_file(tmp_path / "tokens.json", replaced)
+        assert account.get_token() == replaced
+        assert len(exchanges) == 2
+
+        monkeypatch.setattr(account_module, "PRELUDE_TOKEN_REFRESH_BACKOFF", 0)
+        account.get_token()
+        assert len(exchanges) == 3
+
+    def test_file_replaced_during_read(self, tmp_path, monkeypatch):
+        path = tmp_path / "tokens.json"
+        account = new_account(token_file(path, "v1"))
+        load = json.load
+
+        def replace_while_loading(f):
+            data = load(f)
+            token_file(tmp_path / "next.json", "v2")
+            os.replace(tmp_path / "next.json", path)
+            return data
+
+        monkeypatch.setattr(json, "load", replace_while_loading)
+        assert account.get_token() == "v1"
+        monkeypatch.setattr(json, "load", load)
+        assert account.get_token() == "v2"
+
+    def test_unexpected_errors_propagate(self, tmp_path, monkeypatch):
+        def exchange_token(*args):
+            raise KeyError("token")
+
+        monkeypatch.setattr(account_module, "exchange_token", exchange_token)
+        account = new_account(token_file(tmp_path / "tokens.json", jwt(10)))
+        with pytest.raises(KeyError):
+            account.get_token()
+
+
+def refresh_in_threads(location, counter, fresh, threads):
+    """Run in a child process: refresh an expiring token from many threads at once"""
+
+    def exchange_token(*args):
+        with open(counter, "a") as f:
+            f.write("exchange\n")
+        time.sleep(0.2)
+        return dict(token=fresh, refresh_token="rotated")
+
+    account_module.exchange_token = exchange_token
+    barrier = threading.Barrier(threads)
+    tokens = []
+
+    def refresh():
+        account = new_account(location)
+        barrier.wait()
+        tokens.append(account.get_token())
+
+    workers = [threading.Thread(target=refresh) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return tokens
+
+
+class TestRefreshCoalescing:
+    def test_processes_and_threads_share_one_exchange(self, tmp_path):
+        location = token_file(tmp_path / "tokens.json", jwt(10))
+        counter = str(tmp_path / "exchanges")
+        fresh = jwt(3600)
+
+        with multiprocessing.get_context("spawn").Pool(4) as pool:
+            results = pool.starmap(
+                refresh_in_threads, [(location, counter, fresh, 20)] * 4
+            )
+
+        assert [len(tokens) for tokens in results] == [20] * 4
+        assert {token for tokens in results for token in tokens} == {fresh}
+        with open(counter) as f:
+            assert len(f.readlines()) == 1
+        with open(location) as f:
+            assert json.load(f)["user"]["https://api.test"] == dict(
+                token=fresh, refresh_token="rotated"
+            )
+
+
+class TestRefreshHooks:
+    def test_proactive_and_401_refreshes_reach_hooks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            account_module, "exchange_token", lambda *args: dict(token=jwt(3600))
+        )
+        collector = MetricsCollector()
+        account = new_account(token_file(tmp_path / "tokens.json", jwt(10)))
+        account.hooks = [collector]
+
+        account.get_token()
+        account.refresh_tokens(reason="401", method="GET", route="/scm/endpoints")
+
+        lines = collector.prometheus().splitlines()
+        assert (
+            'prelude_sdk_token_refreshes_total{method="",route="",reason="expiring"} 1'
+            in lines
+        )
+        assert (
+            'prelude_sdk_token_refreshes_total{method="GET",route="/scm/endpoints",reason="401"} 1'
+            in lines
+        )
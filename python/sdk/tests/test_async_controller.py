@@ -0,0 +1,177 @@
+import asyncio
+import inspect
+
+import pytest
+
+from prelude_sdk.controllers.async_controller import AsyncController
+from prelude_sdk.controllers.iam_controller import IAMAccountController
+from prelude_sdk.models.errors import TransientError
+from prelude_sdk.models.instrumentation import Hooks
+from prelude_sdk.models.memo_cache import MemoCache
+from prelude_sdk.models.retry_policy import RetryPolicy
+
+from testutils import StubAccount, StubSession
+
+
+def page(*ids):
+    return 200, dict(value=[dict(id=i) for i in ids])
+
+
+def client(*outcomes):
+    client = AsyncController(StubAccount(), max_workers=4, native=False)
+    client.scm._controller._session = StubSession(*outcomes)
+    return client
+
+
+class TestAsyncController:
+    def test_methods_are_coroutines(self):
+        async def run():
+            async with client(page("a")) as c:
+                assert inspect.iscoroutinefunction(c.scm.endpoints)
+                results = await asyncio.gather(*[c.scm.endpoints() for _ in range(3)])
+                return results, c.scm._controller._session.calls
+
+        results, calls = asyncio.run(run())
+        assert results == [dict(value=[dict(id="a")])] * 3
+        assert len(calls) == 3
+
+    def test_iterators_are_async(self):
+        async def run():
+            async with client(page("a", "b"), page("c", "d"), page("e")) as c:
+                records = c.scm.iter_endpoints(page_size=2)
+                assert inspect.isasyncgen(records)
+                return [record["id"] async for record in records]
+
+        assert asyncio.run(run()) == ["a", "b", "c", "d", "e"]
+
+    def test_iterator_closed_early(self):
+        async def run():
+            async with client(page("a", "b")) as c:
+                async for record in c.scm.iter_endpoints(page_size=2):
+                    break
+                return record, len(c.scm._controller._session.calls)
+
+        assert asyncio.run(run()) == (dict(id="a"), 1)
+
+
+class TestNativeAsync:
+    @pytest.fixture(autouse=True)
+    def httpx(self):
+        return pytest.importorskip("httpx")
+
+    def client(self, httpx, handler, **account):
+        transport = httpx.MockTransport(handler)
+        return AsyncController(
+            StubAccount(**account),
+            max_workers=1,
+            client=httpx.AsyncClient(transport=transport),
+        )
+
+    def test_requests_share_one_loop(self, httpx):
+        requests = []
+
+        async def handler(request):
+            requests.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=dict(value=[]))
+
+        async def run():
+            async with self.client(httpx, handler) as c:
+                assert inspect.iscoroutinefunction(c.scm.endpoints)
+                results = await asyncio.gather(
+                    *[c.scm.endpoints(top=10, skip=i * 10) for i in range(500)]
+                )
+                return results, c._executor._threads
+
+        results, threads = asyncio.run(run())
+        assert results == [dict(value=[])] * 500
+        assert not threads
+        assert dict(requests[0].url.params) == {"$top": "10", "$skip": "0"}
+        assert requests[0].headers["authorization"] == "Bearer token"
+
+    def test_retries_transient_failures(self, httpx):
+        outcomes = [httpx.ConnectError("refused"), 503, 200]
+        retries = []
+
+        class Recorder(Hooks):
+            def on_retry(self, method, route, reason, attempt, delay):
+                retries.append(reason)
+
+        def handler(request):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return httpx.Response(outcome, json=dict(id="a"))
+
+        async def run():
+            async with self.client(
+                httpx,
+                handler,
+                retry_policy=RetryPolicy(base_delay=0, max_delay=0),
+                hooks=[Recorder()],
+            ) as c:
+                return await c.scm.list_views()
+
+        assert asyncio.run(run()) == dict(id="a")
+        assert retries == ["ConnectError", "503"]
+
+    def test_connection_failure_is_transient(self, httpx):
+        def handler(request):
+            raise httpx.ConnectError("refused")
+
+        async def run():
+            async with self.client(httpx, handler) as c:
+                await c.scm.endpoints()
+
+        with pytest.raises(TransientError):
+            asyncio.run(run())
+
+    def test_refreshes_on_401(self, httpx):
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers["authorization"])
+            return httpx.Response(401 if len(seen) == 1 else 200, json=dict())
+
+        def refresh_tokens(**kwargs):
+            c.account.headers["authorization"] = "Bearer fresh"
+
+        c = self.client(httpx, handler, token_location="tokens")
+        c.account.refresh_tokens = refresh_tokens
+
+        async def run():
+            async with c:
+                return await c.iam_account.get_account()
+
+        assert asyncio.run(run()) == dict()
+        assert seen == ["Bearer token", "Bearer fresh"]
+
+    def test_memo_cache_shared_with_blocking_methods(self, httpx):
+        def handler(request):
+            raise AssertionError("served from the memo cache")
+
+        cache = MemoCache()
+        account = StubAccount(memo_cache=cache)
+        sync = IAMAccountController(account)
+        sync._session = StubSession((200, dict(id="a")))
+        sync.get_account()
+
+        async def run():
+            transport = httpx.MockTransport(handler)
+            async with AsyncController(
+                account, client=httpx.AsyncClient(transport=transport)
+            ) as c:
+                return await c.iam_account.get_account()
+
+        assert asyncio.run(run()) == dict(id="a")
+
+    def test_other_methods_run_on_threads(self, httpx):
+        async def run():
+            async with self.client(httpx, lambda request: None) as c:
+                return (
+                    inspect.iscoroutinefunction(c.scm.endpoints.__wrapped__),
+                    inspect.iscoroutinefunction(c.jobs.wait_for_job.__wrapped__),
+                    inspect.isasyncgenfunction(c.scm.iter_endpoints),
+                )
+
+        assert asyncio.run(run()) == (True, False, True)
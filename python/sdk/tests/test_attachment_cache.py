@@ -0,0 +1,73 @@
+import os
+
+from prelude_sdk.controllers.detect_controller import DetectController
+from prelude_sdk.models.attachment_cache import AttachmentCache
+
+from testutils import stub_controller, stub_response
+
+
+def attachment(content: bytes, status=200, headers=None):
+    res = stub_response(status, None, headers)
+    res._content = content
+    return res
+
+
+def blobs(directory):
+    return [f for _, _, files in os.walk(directory / "blobs") for f in files]
+
+
+class TestAttachmentCache:
+    def test_round_trip(self, tmp_path):
+        cache = AttachmentCache(str(tmp_path))
+        cache.put("test", "test.go", b"package main", etag='"v1"')
+
+        entry = cache.get("test", "test.go")
+        assert cache.read(entry) == b"package main"
+        assert cache.validators(entry) == {"If-None-Match": '"v1"'}
+        assert cache.get("test", "other.go") is None
+
+    def test_identical_content_stored_once(self, tmp_path):
+        cache = AttachmentCache(str(tmp_path))
+        cache.put("a", "shared.sh", b"echo hello")
+        cache.put("b", "shared.sh", b"echo hello")
+        cache.put("b", "other.sh", b"echo bye")
+
+        assert len(blobs(tmp_path)) == 2
+        assert cache.get("a", "shared.sh") == cache.get("b", "shared.sh")
+
+    def test_index_persists_across_instances(self, tmp_path):
+        cache = AttachmentCache(str(tmp_path))
+        cache.put("test", "test.go", b"package main", last_modified="yesterday")
+        cache.put("test", "gone.go", b"package gone")
+        cache.save()
+        os.remove(cache._blob(cache.get("test", "gone.go")["sha256"]))
+
+        reloaded = AttachmentCache(str(tmp_path))
+        entry = reloaded.get("test", "test.go")
+        assert reloaded.read(entry) == b"package main"
+        assert reloaded.validators(entry) == {"If-Modified-Since": "yesterday"}
+        assert reloaded.get("test", "gone.go") is None
+
+    def test_download_revalidates_against_cache(self, tmp_path):
+        cache = AttachmentCache(str(tmp_path))
+        detect = stub_controller(
+            DetectController,
+            attachment(b"v1", headers=dict(ETag='"v1"')),
+            attachment(b"", status=304),
+            attachment(b"v2", headers=dict(ETag='"v2"')),
+        )
+
+        assert detect.download("test", "test.go", cache=cache) == b"v1"
+        assert detect.download("test", "test.go", cache=cache) == b"v1"
+        assert detect.download("test", "test.go", cache=cache) == b"v2"
+
+        sent = [kwargs["headers"] for _, _, kwargs in detect._session.calls]
+        assert "If-None-Match" not in sent[0]
+        assert sent[1]["If-None-Match"] == '"v1"'
+        assert sent[2]["If-None-Match"] == '"v1"'
+        assert cache.get("test", "test.go")["etag"] == '"v2"'
+
+    def test_download_without_cache(self):
+        detect = stub_controller(DetectController, attachment(b"v1"))
+        assert detect.download("test", "test.go") == b"v1"
+        assert "If-None-Match" not in detect._session.calls[0][2]["headers"]
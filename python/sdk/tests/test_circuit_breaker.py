@@ -0,0 +1,101 @@
+import time
+
+import pytest
+import requests
+
+from prelude_sdk.controllers.http_controller import HttpController
+from prelude_sdk.models.circuit_breaker import CircuitBreaker
+from prelude_sdk.models.errors import CircuitOpenError, TransientError
+
+from testutils import stub_controller
+
+URL = "https://api.test/scm/evaluations"
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record(breaker.before("GET", URL), success=False)
+
+
+class TestCircuitBreaker:
+    def setup_method(self):
+        self.breaker = CircuitBreaker(failure_threshold=2, cooldown=0.05)
+
+    def state(self):
+        return self.breaker.state()["api.test/scm/evaluations"]["state"]
+
+    def test_opens_after_threshold(self):
+        trip(self.breaker)
+        assert self.state() == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            self.breaker.before("GET", URL)
+        assert self.breaker.before("GET", "https://api.test/scm/endpoints")
+
+    def test_half_open_probe_closes(self):
+        trip(self.breaker)
+        time.sleep(0.06)
+        route = self.breaker.before("GET", URL)
+        assert self.state() == CircuitBreaker.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            self.breaker.before("GET", URL)
+        self.breaker.record(route, success=True)
+        assert self.state() == CircuitBreaker.CLOSED
+        self.breaker.before("GET", URL)
+
+    def test_half_open_probe_reopens(self):
+        trip(self.breaker)
+        time.sleep(0.06)
+        self.breaker.record(self.breaker.before("GET", URL), success=False)
+        assert self.state() == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            self.breaker.before("GET", URL)
+
+    def test_lost_probe_times_out(self):
+        self.breaker.probe_timeout = 0.05
+        trip(self.breaker)
+        time.sleep(0.06)
+        self.breaker.before("GET", URL)
+        with pytest.raises(CircuitOpenError):
+            self.breaker.before("GET", URL)
+        time.sleep(0.06)
+        assert self.breaker.before("GET", URL)
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.InvalidURL,
+            KeyboardInterrupt,
+        ],
+    )
+    def test_probe_released_on_client_side_exception(self, error):
+        controller = stub_controller(
+            HttpController, error, (200, {}), circuit_breaker=self.breaker
+        )
+        trip(self.breaker)
+        time.sleep(0.06)
+        with pytest.raises(error):
+            controller.get(URL)
+        assert self.state() == CircuitBreaker.HALF_OPEN
+        assert controller.get(URL).status_code == 200
+        assert self.state() == CircuitBreaker.CLOSED
+
+    def test_client_side_exceptions_do_not_open(self):
+        controller = stub_controller(
+            HttpController, KeyboardInterrupt, circuit_breaker=self.breaker
+        )
+        for _ in range(self.breaker.failure_threshold + 1):
+            with pytest.raises(KeyboardInterrupt):
+                controller.get(URL)
+        assert self.state() == CircuitBreaker.CLOSED
+
+    def test_controller_fails_fast(self):
+        controller = stub_controller(
+            HttpController, (503, {}), circuit_breaker=self.breaker
+        )
+        for _ in range(2):
+            with pytest.raises(TransientError):
+                controller.get(URL)
+        with pytest.raises(CircuitOpenError):
+            controller.get(URL)
+        assert len(controller._session.calls) == 2
@@ -0,0 +1,104 @@
+import threading
+import time
+
+from prelude_sdk.controllers.detect_controller import DetectController
+
+from testutils import StubAccount, stub_response
+
+
+class RoutedSession:
+    """Answers by URL from any number of threads, tracking how many requests overlap"""
+
+    def __init__(self, routes: dict, delay: float = 0.01):
+        self.routes = routes
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            status, body = self.routes.get(
+                url.removeprefix("https://api.test"), (404, None)
+            )
+            if not isinstance(body, bytes):
+                return stub_response(status, body)
+            res = stub_response(status)
+            res._content = body
+            return res
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def catalog(tests: dict) -> dict:
+    routes = {"/detect/tests": (200, [dict(id=test_id) for test_id in tests])}
+    for test_id, files in tests.items():
+        routes[f"/detect/tests/{test_id}"] = (200, dict(attachments=list(files)))
+        for filename, content in files.items():
+            routes[f"/detect/tests/{test_id}/{filename}"] = (200, content)
+    return routes
+
+
+def detect(routes, **kwargs):
+    controller = DetectController(StubAccount())
+    controller._session = RoutedSession(routes, **kwargs)
+    return controller
+
+
+TESTS = {
+    f"test-{t}": {f"file-{f}.go": f"{t}:{f}".encode() for f in range(3)}
+    for t in range(4)
+}
+
+
+class TestCloneTests:
+    def test_downloads_within_concurrency_cap(self, tmp_path):
+        controller = detect(catalog(TESTS))
+
+        summary = controller.clone_tests(
+            list(TESTS), output_dir=str(tmp_path), max_workers=3
+        )
+
+        assert 1 < controller._session.peak <= 3
+        assert summary["files"] == 12 and summary["failed"] == []
+        assert summary["bytes"] == sum(
+            len(c) for f in TESTS.values() for c in f.values()
+        )
+        for test_id, files in TESTS.items():
+            for filename, content in files.items():
+                assert (tmp_path / test_id / filename).read_bytes() == content
+
+    def test_clones_every_test_by_default(self, tmp_path):
+        summary = detect(catalog(TESTS)).clone_tests(output_dir=str(tmp_path))
+        assert summary["tests"] == 4 and summary["files"] == 12
+
+    def test_failures_are_summarized(self, tmp_path):
+        routes = catalog(TESTS)
+        del routes["/detect/tests/test-1"]
+        routes["/detect/tests/test-2/file-0.go"] = (500, b"boom")
+
+        summary = detect(routes).clone_tests(list(TESTS), output_dir=str(tmp_path))
+
+        failed = sorted(summary["failed"], key=lambda f: f["test_id"])
+        assert [(f["test_id"], f.get("filename")) for f in failed] == [
+            ("test-1", None),
+            ("test-2", "file-0.go"),
+        ]
+        assert failed[1]["error"] == "boom"
+        assert summary["files"] == 8
+        assert not (tmp_path / "test-1").exists()
+        assert not (tmp_path / "test-2" / "file-0.go").exists()
+
+    def test_progress(self, tmp_path):
+        calls = []
+        detect(catalog(TESTS)).clone_tests(
+            list(TESTS),
+            output_dir=str(tmp_path),
+            progress=lambda completed, total: calls.append((completed, total)),
+        )
+        assert calls == [(n, 12) for n in range(1, 13)]
@@ -0,0 +1,51 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from prelude_sdk.controllers.detect_controller import DetectController
+
+from testutils import StubAccount, StubSession
+
+START = datetime(2024, 1, 1)
+
+
+class TestActivityShards:
+    def setup_method(self):
+        self.controller = DetectController(StubAccount())
+        self.controller._session = StubSession((200, []))
+        self.windows = []
+
+        def describe_activity(filters, view):
+            start, finish = filters["start"], filters["finish"]
+            self.windows.append((start, finish))
+            time.sleep(random.uniform(0, 0.02))
+            hours = range(int((finish - start).total_seconds() // 3600) + 1)
+            records = [
+                dict(created=(start + timedelta(hours=h)).isoformat(), test="t")
+                for h in hours
+            ]
+            return list(reversed(records)) + [dict(test="undated")]
+
+        self.controller.describe_activity = describe_activity
+
+    def test_records_oldest_first(self):
+        filters = dict(start=START, finish=START + timedelta(days=3, hours=-1))
+        records = list(
+            self.controller.iter_activity(filters, shard=timedelta(days=1), workers=3)
+        )
+
+        dated = [r["created"] for r in records if "created" in r]
+        assert dated == sorted(dated)
+        assert len(dated) == 72
+        assert [r["test"] for r in records].count("undated") == 3
+        assert records[-1] == dict(test="undated")
+
+    def test_shards_cover_range(self):
+        filters = dict(start=START, finish=START + timedelta(hours=5))
+        list(self.controller.iter_activity(filters, shard=timedelta(hours=2)))
+
+        assert sorted(self.windows) == [
+            (START, START + timedelta(hours=2, microseconds=-1)),
+            (START + timedelta(hours=2), START + timedelta(hours=4, microseconds=-1)),
+            (START + timedelta(hours=4), START + timedelta(hours=5)),
+        ]
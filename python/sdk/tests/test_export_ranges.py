@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from prelude_sdk.controllers.export_controller import ExportController
+from prelude_sdk.controllers.http_controller import close_sessions
+
+from testutils import StubAccount
+
+CONTENT = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def server():
+    """Serves CONTENT with an ETag, honoring Range headers unless ranges is False"""
+    state = dict(content=CONTENT, etag='"v1"', ranges=True, requested=[])
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            content = state["content"]
+            requested = self.headers.get("Range")
+            with lock:
+                state["requested"].append(requested)
+            if requested and state["ranges"]:
+                start, end = requested.removeprefix("bytes=").split("-")
+                start, end = int(start), min(int(end), len(content) - 1)
+                body = content[start : end + 1]
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+            else:
+                body = content
+                self.send_response(200)
+            self.send_header("ETag", state["etag"])
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/export.csv", state
+    httpd.shutdown()
+    close_sessions()
+
+
+def leftovers(output):
+    directory, name = os.path.split(output)
+    return sorted(f for f in os.listdir(directory) if f.startswith(f"{name}."))
+
+
+def write_manifest(output, size, etag, segments):
+    with open(f"{output}.parts.json", "w") as f:
+        json.dump(dict(size=size, etag=etag, segments=segments), f)
+
+
+class TestDownloadRanges:
+    def test_full_download(self, server, tmp_path):
+        url, state = server
+        output = str(tmp_path / "export.csv")
+        progress = []
+
+        result = ExportController(StubAccount()).download_ranges(
+            url,
+            output,
+            connections=4,
+            chunk_size=512,
+            progress=lambda written, rate: progress.append(written),
+        )
+
+        with open(output, "rb") as f:
+            assert f.read() == CONTENT
+        assert result["bytes"] == len(CONTENT)
+        assert leftovers(output) == []
+        assert sorted(state["requested"][1:]) == [
+            "bytes=0-2559",
+            "bytes=2560-5119",
+            "bytes=5120-7679",
+            "bytes=7680-10239",
+        ]
+        assert progress[-1] == len(CONTENT)
+
+    def test_resumes_from_parts(self, server, tmp_path):
+        url, state = server
+        output = str(tmp_path / "export.csv")
+        half = len(CONTENT) // 2
+        write_manifest(
+            output, len(CONTENT), '"v1"', [(0, half - 1), (half, len(CONTENT) - 1)]
+        )
+        with open(f"{output}.part0", "wb") as f:
+            f.write(CONTENT[:half])
+        with open(f"{output}.part1", "wb") as f:
+            f.write(CONTENT[half : half + 100])
+
+        ExportController(StubAccount()).download_ranges(url, output, connections=2)
+
+        with open(output, "rb") as f:
+            assert f.read() == CONTENT
+        assert state["requested"][1:] == [f"bytes={half + 100}-{len(CONTENT) - 1}"]
+        assert leftovers(output) == []
+
+    @pytest.mark.parametrize(
+        "size, etag", [(len(CONTENT), '"v0"'), (len(CONTENT) - 1, '"v1"')]
+    )
+    def test_changed_export_discards_parts(self, server, tmp_path, size, etag):
+        url, state = server
+        output = str(tmp_path / "export.csv")
+        write_manifest(output, size, etag, [(0, 99), (100, size - 1)])
+        for i in range(2):
+            with open(f"{output}.part{i}", "wb") as f:
+                f.write(b"stale" * 10)
+
+        ExportController(StubAccount()).download_ranges(url, output, connections=1)
+
+        with open(output, "rb") as f:
+            assert f.read() == CONTENT
+        assert state["requested"][1:] == [f"bytes=0-{len(CONTENT) - 1}"]
+        assert leftovers(output) == []
+
+    def test_falls_back_without_range_support(self, server, tmp_path):
+        url, state = server
+        state["ranges"] = False
+        output = str(tmp_path / "export.csv")
+
+        ExportController(StubAccount()).download_ranges(url, output, connections=4)
+
+        with open(output, "rb") as f:
+            assert f.read() == CONTENT
+        assert state["requested"] == ["bytes=0-0", None]
+        assert leftovers(output) == []
@@ -0,0 +1,51 @@
+from prelude_sdk.models.instrumentation import MetricsCollector, route_template
+
+
+class TestInstrumentation:
+    def test_route_template(self):
+        assert (
+            route_template(
+                "https://api/detect/tests/5f2c3f8e-8f0a-4c1a-9d3e-2b7a1c9e0f11/a.go"
+            )
+            == "/detect/tests/{id}/{file}"
+        )
+        assert (
+            route_template(
+                "https://api/detect/tests/5f2c3f8e-8f0a-4c1a-9d3e-2b7a1c9e0f11/"
+                "5f2c3f8e-8f0a-4c1a-9d3e-2b7a1c9e0f11_linux-x86_64.go"
+            )
+            == "/detect/tests/{id}/{file}"
+        )
+        assert (
+            route_template(
+                "https://api/export/scm-5f2c3f8e-8f0a-4c1a-9d3e-2b7a1c9e0f11/parts"
+            )
+            == "/export/scm-{id}/parts"
+        )
+        assert route_template("https://api/partner/endpoints/CROWDSTRIKE") == (
+            "/partner/endpoints/CROWDSTRIKE"
+        )
+
+    def test_prometheus(self):
+        collector = MetricsCollector(buckets=(0.1, 1))
+        collector.after_response("GET", "/scm/endpoints", 200, 0, 100, 0.05, 0)
+        collector.after_response("GET", "/scm/endpoints", 200, 0, 300, 0.5, 1)
+        collector.on_retry("GET", "/scm/endpoints", "503", 1, 0.2)
+
+        labels = 'method="GET",route="/scm/endpoints",status="200"'
+        lines = collector.prometheus().splitlines()
+        assert (
+            f'prelude_sdk_request_duration_seconds_bucket{{{labels},le="0.1"}} 1'
+            in lines
+        )
+        assert (
+            f'prelude_sdk_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2'
+            in lines
+        )
+        assert f"prelude_sdk_request_duration_seconds_count{{{labels}}} 2" in lines
+        assert f"prelude_sdk_response_bytes_total{{{labels}}} 400" in lines
+        assert (
+            'prelude_sdk_retries_total{method="GET",route="/scm/endpoints",reason="503"} 1'
+            in lines
+        )
+        assert collector.snapshot()[("GET", "/scm/endpoints", "200")]["count"] == 2
@@ -0,0 +1,103 @@
+import pytest
+
+from prelude_sdk.controllers import jobs_controller
+from prelude_sdk.controllers.jobs_controller import JobsController, poll_until
+
+from testutils import stub_controller
+
+
+class Clock:
+    """Stands in for the time module: sleeping advances monotonic() instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(jobs_controller, "time", clock)
+    return clock
+
+
+def job(job_id, done=False):
+    return dict(id=job_id, end_time="2024-01-01T00:00:00Z" if done else None)
+
+
+class TestPollUntil:
+    def test_returns_first_done_result(self, clock):
+        results = iter([1, 2, 3])
+        assert poll_until(lambda: next(results), lambda n: n == 3) == 3
+        assert len(clock.sleeps) == 2
+
+    def test_backoff_stays_within_bounds(self, clock):
+        results = iter(range(20))
+        poll_until(
+            lambda: next(results), lambda n: n == 19, initial_delay=1, max_delay=4
+        )
+        assert clock.sleeps[0] == 1
+        assert all(1 <= delay <= 4 for delay in clock.sleeps)
+
+    def test_deadline(self, clock):
+        with pytest.raises(TimeoutError):
+            poll_until(lambda: None, lambda _: False, timeout=5, initial_delay=2)
+        assert clock.now == 5
+
+    def test_zero_timeout_is_a_deadline(self, clock):
+        with pytest.raises(TimeoutError):
+            poll_until(lambda: None, lambda _: False, timeout=0)
+        assert clock.sleeps == []
+
+
+class TestWaitForJobs:
+    def test_wait_for_job(self, clock):
+        jobs = stub_controller(
+            JobsController, (200, job("a")), (200, job("a")), (200, job("a", True))
+        )
+        assert jobs.wait_for_job("a") == job("a", True)
+        assert len(jobs._session.calls) == 3
+
+    def test_wait_for_job_timeout(self, clock):
+        jobs = stub_controller(JobsController, (200, job("a")))
+        with pytest.raises(TimeoutError):
+            jobs.wait_for_job("a", timeout=3)
+
+    def test_falls_back_to_job_status_and_reports_completion(self, clock):
+        completed = []
+        jobs = stub_controller(
+            JobsController,
+            (200, dict(recent=[job("a"), job("other")])),
+            (200, job("b")),
+            (200, dict(recent=[job("a", True)])),
+            (200, job("b", True)),
+        )
+
+        statuses = jobs.wait_for_jobs(["b", "a"], on_complete=completed.append)
+
+        assert statuses == [job("b", True), job("a", True)]
+        assert completed == [job("a", True), job("b", True)]
+        urls = [url for _, url, _ in jobs._session.calls]
+        assert urls == [
+            "https://api.test/jobs/statuses",
+            "https://api.test/jobs/statuses/b",
+            "https://api.test/jobs/statuses",
+            "https://api.test/jobs/statuses/b",
+        ]
+
+    def test_wait_for_jobs_timeout(self, clock):
+        completed = []
+        jobs = stub_controller(
+            JobsController,
+            (200, dict(recent=[job("a", True), job("b")])),
+        )
+        with pytest.raises(TimeoutError):
+            jobs.wait_for_jobs(["a", "b"], timeout=10, on_complete=completed.append)
+        assert completed == [job("a", True)]
@@ -0,0 +1,65 @@
+import time
+
+from prelude_sdk.models.memo_cache import MemoCache, invalidates, memoize
+
+
+class FakeAccount:
+    def __init__(self, memo_cache):
+        self.account = "account"
+        self.memo_cache = memo_cache
+
+
+class FakeController:
+    def __init__(self, account):
+        self.account = account
+        self.calls = 0
+        self.groups = ["a"]
+
+    @memoize("groups", ttl=0.2)
+    def list_groups(self, filter: str = None):
+        self.calls += 1
+        return dict(filter=filter, groups=list(self.groups))
+
+    @invalidates("groups")
+    def add_group(self, group: str):
+        self.groups.append(group)
+
+
+class TestMemoCache:
+    def setup_method(self):
+        self.cache = MemoCache(maxsize=2)
+        self.controller = FakeController(FakeAccount(self.cache))
+
+    def test_hits_and_copies(self):
+        first = self.controller.list_groups()
+        first["groups"].append("mutated")
+        assert self.controller.list_groups() == dict(filter=None, groups=["a"])
+        assert self.controller.calls == 1
+        assert self.cache.stats() == {
+            "FakeController.list_groups": dict(hits=1, misses=1)
+        }
+
+    def test_ttl_expiry(self):
+        self.controller.list_groups()
+        time.sleep(0.25)
+        self.controller.list_groups()
+        assert self.controller.calls == 2
+
+    def test_lru_bound(self):
+        for f in ("x", "y", "z"):
+            self.controller.list_groups(filter=f)
+        self.controller.list_groups(filter="z")
+        self.controller.list_groups(filter="x")
+        assert self.controller.calls == 4
+
+    def test_mutation_invalidates(self):
+        self.controller.list_groups()
+        self.controller.add_group("b")
+        assert self.controller.list_groups()["groups"] == ["a", "b"]
+        assert self.controller.calls == 2
+
+    def test_disabled_without_cache(self):
+        controller = FakeController(FakeAccount(None))
+        controller.list_groups()
+        controller.list_groups()
+        assert controller.calls == 2
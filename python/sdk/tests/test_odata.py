@@ -0,0 +1,61 @@
+import pytest
+
+from prelude_sdk.models.odata import apply, compile_filter
+
+RECORDS = [
+    dict(
+        id=str(i),
+        hostname=f"host-{i}",
+        os="windows" if i % 2 else "linux",
+        created=f"2024-01-{i + 1:02d}T00:00:00Z",
+        instances=[dict(control=i % 3, policy=dict(name="default"))],
+        tags=["a"] if i else None,
+    )
+    for i in range(10)
+]
+
+
+class TestOData:
+    @pytest.mark.parametrize(
+        "filter,expected",
+        [
+            ("hostname eq 'host-3'", ["3"]),
+            ("contains(hostname, '1')", ["1"]),
+            ("os eq 'linux' and id gt '4'", ["6", "8"]),
+            ("not (os eq 'linux') or id eq '0'", ["0", "1", "3", "5", "7", "9"]),
+            ("instances/any(i: i/control eq 1)", ["1", "4", "7"]),
+            (
+                "instances/all(i: i/policy/name eq 'default')",
+                [str(i) for i in range(10)],
+            ),
+            ("created ge 2024-01-08", ["7", "8", "9"]),
+            ("id in ('1', '2')", ["1", "2"]),
+            ("tags eq null", ["0"]),
+            ("toupper(hostname) eq 'HOST-2'", ["2"]),
+        ],
+    )
+    def test_filter(self, filter, expected):
+        assert [r["id"] for r in apply(RECORDS, filter=filter)] == expected
+
+    def test_orderby_select_paging(self):
+        res = apply(RECORDS, orderby="os desc, id asc", select="id,os", top=2, skip=1)
+        assert res == [dict(id="3", os="windows"), dict(id="5", os="windows")]
+
+    def test_select_through_collections(self):
+        res = apply(
+            RECORDS[:2],
+            select="id, instances/control, instances/policy/name, missing/field",
+        )
+        assert res == [
+            dict(
+                id=str(i),
+                instances=[dict(control=i, policy=dict(name="default"))],
+                missing=dict(field=None),
+            )
+            for i in range(2)
+        ]
+
+    @pytest.mark.parametrize("filter", ["hostname eq", "(id eq '1'", "id ~ '1'"])
+    def test_invalid(self, filter):
+        with pytest.raises(ValueError):
+            compile_filter(filter)
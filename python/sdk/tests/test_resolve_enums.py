@@ -0,0 +1,102 @@
+import copy
+import random
+import timeit
+
+import pytest
+
+from prelude_sdk.controllers.http_controller import HttpController
+from prelude_sdk.models.codes import Control, ControlCategory, PartnerEvents
+
+SCM_ENUMS = [
+    (Control, "controls"),
+    (Control, "control"),
+    (ControlCategory, "category"),
+    (PartnerEvents, "event"),
+]
+
+
+def resolve_per_key(data, enum_params):
+    """The previous implementation: one full traversal per (enum_class, key)"""
+
+    def _resolve_enum(data, enum_class, key):
+        if isinstance(data, list):
+            for item in data:
+                if isinstance(item, dict):
+                    _resolve_enum(item, enum_class, key)
+        elif isinstance(data, dict):
+            for k, v in data.items():
+                if k == key:
+                    if isinstance(v, list):
+                        for i, item in enumerate(v):
+                            v[i] = enum_class[item].name
+                    elif v is not None:
+                        data[k] = enum_class[v].name
+                elif isinstance(v, dict) or isinstance(v, list):
+                    _resolve_enum(v, enum_class, key)
+
+    for enum_class, key in enum_params:
+        _resolve_enum(data, enum_class, key)
+
+
+def scm_endpoints(n):
+    rng = random.Random(n)
+    controls = [c.value for c in Control]
+    return [
+        dict(
+            id=f"endpoint-{i}",
+            hostname=f"host-{i}",
+            controls=rng.sample(controls, 3),
+            instances=[
+                dict(
+                    control=rng.choice(controls),
+                    category=rng.choice([str(c.value) for c in ControlCategory]),
+                    policy=dict(id=f"policy-{i}", name="default", settings=[]),
+                )
+                for _ in range(3)
+            ],
+            events=[
+                dict(event=rng.choice([e.name for e in PartnerEvents]), created="2024")
+                for _ in range(2)
+            ],
+            os=None,
+            tags=["a", "b"],
+        )
+        for i in range(n)
+    ]
+
+
+class TestResolveEnums:
+    def setup_class(self):
+        self.controller = HttpController(account=None)
+
+    def test_matches_per_key_resolution(self):
+        data = scm_endpoints(500)
+        data.append(dict(control="crowdstrike", category=None, event=-42))
+        expected = copy.deepcopy(data)
+        resolve_per_key(expected, SCM_ENUMS)
+
+        self.controller.resolve_enums(data, SCM_ENUMS)
+        assert data == expected
+        assert data[-1] == dict(control="CROWDSTRIKE", category=None, event="INVALID")
+
+    def test_single_pass_is_faster(self, timing):
+        if not timing:
+            pytest.skip("Not timing mode")
+        data = scm_endpoints(5000)
+        copies = [copy.deepcopy(data) for _ in range(6)]
+
+        per_key = min(
+            timeit.repeat(
+                lambda: resolve_per_key(copies.pop(), SCM_ENUMS), number=1, repeat=3
+            )
+        )
+        single_pass = min(
+            timeit.repeat(
+                lambda: self.controller.resolve_enums(copies.pop(), SCM_ENUMS),
+                number=1,
+                repeat=3,
+            )
+        )
+        assert (
+            single_pass * 2 < per_key
+        ), f"per-key {per_key:.3f}s, single-pass {single_pass:.3f}s"
@@ -0,0 +1,36 @@
+import os
+import threading
+
+from prelude_sdk.models.response_cache import ResponseCache
+
+from testutils import stub_response
+
+
+class TestResponseCache:
+    def test_round_trip(self, tmp_path):
+        cache = ResponseCache(str(tmp_path))
+        key = cache.key("account", "https://api.test/scm/endpoints", dict(top=1))
+        cache.store(key, stub_response(200, dict(a=1), dict(ETag='"v1"')))
+
+        assert cache.validators(key) == {"If-None-Match": '"v1"'}
+        assert cache.load(key).json() == dict(a=1)
+        assert os.listdir(tmp_path) == [f"{key}.entry"]
+
+    def test_concurrent_stores_keep_etag_with_its_body(self, tmp_path):
+        cache = ResponseCache(str(tmp_path))
+        key = cache.key("account", "https://api.test/scm/endpoints")
+
+        def store(version):
+            for _ in range(50):
+                cache.store(
+                    key, stub_response(200, dict(v=version), dict(ETag=f'"{version}"'))
+                )
+
+        threads = [threading.Thread(target=store, args=(v,)) for v in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        res = cache.load(key)
+        assert res.headers["ETag"] == f'"{res.json()["v"]}"'
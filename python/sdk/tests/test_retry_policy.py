@@ -0,0 +1,116 @@
+import pytest
+import requests
+
+from prelude_sdk.controllers.http_controller import HttpController
+from prelude_sdk.models.errors import APIError, TransientError
+from prelude_sdk.models.rate_limiter import RateLimiter
+from prelude_sdk.models.retry_policy import RetryPolicy
+
+from testutils import stub_controller
+
+URL = "https://api.test/scm/endpoints"
+
+
+def policy(**kwargs):
+    return RetryPolicy(**dict(dict(base_delay=0.001, max_delay=0.001), **kwargs))
+
+
+class TestRetryPolicy:
+    def test_get_retries_5xx(self):
+        controller = stub_controller(
+            HttpController, (503, {}), (502, {}), (200, {}), retry_policy=policy()
+        )
+        res = controller.get(URL)
+        assert res.status_code == 200
+        assert len(controller._session.calls) == 3
+
+    def test_get_gives_up_after_total(self):
+        controller = stub_controller(
+            HttpController, (503, {}), retry_policy=policy(total=2)
+        )
+        with pytest.raises(TransientError) as e:
+            controller.get(URL)
+        assert e.value.status == 503
+        assert e.value.attempts == 3
+
+    def test_post_not_retried(self):
+        controller = stub_controller(
+            HttpController, (503, {}), (200, {}), retry_policy=policy()
+        )
+        with pytest.raises(TransientError):
+            controller.post(URL)
+        assert len(controller._session.calls) == 1
+
+    def test_safe_post_retried(self):
+        controller = stub_controller(
+            HttpController, (503, {}), (200, {}), retry_policy=policy()
+        )
+        assert controller.post(URL, safe=True).status_code == 200
+        assert len(controller._session.calls) == 2
+
+    def test_unsent_post_retried(self):
+        controller = stub_controller(
+            HttpController,
+            requests.ConnectTimeout(),
+            requests.ReadTimeout(),
+            retry_policy=policy(),
+        )
+        with pytest.raises(TransientError) as e:
+            controller.post(URL)
+        assert e.value.status is None
+        assert e.value.attempts == 2
+
+    def test_client_errors_not_retried(self):
+        controller = stub_controller(HttpController, (404, {}), retry_policy=policy())
+        with pytest.raises(APIError) as e:
+            controller.get(URL)
+        assert not isinstance(e.value, TransientError)
+        assert len(controller._session.calls) == 1
+
+    def test_budget_exhaustion(self):
+        shared = policy(budget_ratio=0, budget_reserve=2)
+        controller = stub_controller(HttpController, (503, {}), retry_policy=shared)
+        with pytest.raises(TransientError):
+            controller.get(URL)
+        assert len(controller._session.calls) == 3
+        with pytest.raises(TransientError):
+            controller.get(URL)
+        assert len(controller._session.calls) == 4
+        assert shared.retries == 2
+
+
+class TestRateLimiter:
+    def test_retry_after_pauses_limiter(self):
+        limiter = RateLimiter(rate=1000)
+        controller = stub_controller(
+            HttpController,
+            (429, {}, {"Retry-After": "0.1"}),
+            (200, {}),
+            rate_limiter=limiter,
+        )
+        assert controller.get(URL).status_code == 200
+        assert len(controller._session.calls) == 2
+        assert limiter.stats()["requests"] == 2
+        assert limiter.stats()["throttled_seconds"] >= 0.09
+
+    def test_429_retries_bounded(self):
+        limiter = RateLimiter(rate=1000, max_retries=2)
+        controller = stub_controller(
+            HttpController, (429, {}, {"Retry-After": "0"}), rate_limiter=limiter
+        )
+        with pytest.raises(APIError) as e:
+            controller.get(URL)
+        assert e.value.status == 429
+        assert len(controller._session.calls) == 3
+
+    def test_exhausted_window_pauses(self):
+        limiter = RateLimiter(rate=1000)
+        res = requests.Response()
+        res.status_code = 200
+        res.headers.update({"RateLimit-Remaining": "0", "RateLimit-Reset": "2"})
+        assert limiter.update(res) == 2
+
+    def test_paces_to_rate(self):
+        limiter = RateLimiter(rate=50, burst=1)
+        waited = sum(limiter.acquire() for _ in range(4))
+        assert waited >= 0.05
@@ -1,3 +1,4 @@
+import gzip
 import json
 import os
 import pytest
@@ -121,6 +122,24 @@ class TestScmAcrossControls:
         csv = requests.get(result["results"]["url"], timeout=10).content.decode("utf-8")
         assert len(csv.strip("\r\n").split("\r\n")) == 2
 
+    def test_download_export(self, unwrap, tmp_path):
+        job_id = unwrap(self.export.export_scm)(
+            self.export, SCMCategory.ENDPOINT, top=1
+        )["job_id"]
+        while (result := unwrap(self.jobs.job_status)(self.jobs, job_id))[
+            "end_time"
+        ] is None:
+            time.sleep(3)
+        assert result["successful"], result
+        output_file = tmp_path / "endpoints.csv.gz"
+        download = self.export.download(
+            result["results"]["url"], str(output_file), compress=True
+        )
+        with gzip.open(output_file) as f:
+            csv = f.read().decode("utf-8")
+        assert download["bytes"] == len(csv.encode("utf-8"))
+        assert len(csv.strip("\r\n").split("\r\n")) == 2
+
     def test_setup_for_per_control(self, unwrap):
         timeout = time.time() + 300
         while (
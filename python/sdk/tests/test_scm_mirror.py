@@ -0,0 +1,100 @@
+import pytest
+
+from prelude_sdk.models.scm_mirror import ScmMirror
+
+
+class FakeAccount:
+    account = "account"
+
+
+class FakeScm:
+    """Serves in-memory records the way ScmController's iter_* methods page them"""
+
+    def __init__(self):
+        self.account = FakeAccount()
+        self.records = dict(
+            endpoints=[dict(id=str(i), hostname=f"host-{i}") for i in range(5)],
+            inboxes=[dict(id="inbox")],
+            users=[],
+            network_devices=[],
+        )
+        self.history = []
+        self.calls = []
+
+    def list_history(self, start_date=None):
+        self.calls.append(("history", start_date))
+        return self.history
+
+    def _iterate(self, table, filter=None, page_size=None, workers=None):
+        self.calls.append((table, filter))
+        for record in self.records[table]:
+            if filter is None or record.get("modified"):
+                yield record
+
+    def iter_endpoints(self, **kwargs):
+        return self._iterate("endpoints", **kwargs)
+
+    def iter_inboxes(self, **kwargs):
+        return self._iterate("inboxes", **kwargs)
+
+    def iter_users(self, **kwargs):
+        return self._iterate("users", **kwargs)
+
+    def iter_network_devices(self, **kwargs):
+        return self._iterate("network_devices", **kwargs)
+
+
+class TestScmMirror:
+    @pytest.fixture
+    def scm(self):
+        return FakeScm()
+
+    @pytest.fixture
+    def mirror(self, scm, tmp_path):
+        mirror = ScmMirror(scm, location=str(tmp_path / "scm.db"))
+        yield mirror
+        mirror.close()
+
+    def test_bulk_load(self, mirror, scm):
+        assert mirror.sync() == dict(endpoints=5, inboxes=1, users=0, network_devices=0)
+        assert ("history", None) not in scm.calls
+        assert mirror.get("endpoints", "3") == dict(id="3", hostname="host-3")
+        assert mirror.odata("endpoints", filter="hostname eq 'host-1'") == [
+            dict(id="1", hostname="host-1")
+        ]
+        assert set(mirror.watermarks()) == {
+            "endpoints",
+            "inboxes",
+            "users",
+            "network_devices",
+        }
+
+    def test_no_events_no_reload(self, mirror, scm):
+        mirror.sync()
+        watermarks = mirror.watermarks()
+        scm.calls.clear()
+
+        assert mirror.sync() == dict(endpoints=0, inboxes=0, users=0, network_devices=0)
+        assert scm.calls == [("history", min(watermarks.values()))]
+        assert mirror.watermarks()["endpoints"] > watermarks["endpoints"]
+        assert len(mirror.query("endpoints")) == 5
+
+    def test_events_upsert_modified_records(self, mirror, scm):
+        mirror.sync()
+        watermark = mirror.watermarks()["endpoints"]
+        scm.calls.clear()
+        scm.history = [dict(category="ENDPOINT"), dict(category="INVALID")]
+        scm.records["endpoints"][2] = dict(id="2", hostname="renamed", modified=True)
+        scm.records["endpoints"].append(dict(id="9", hostname="new", modified=True))
+
+        assert mirror.sync() == dict(endpoints=2, inboxes=0, users=0, network_devices=0)
+        assert ("endpoints", f"updated ge {watermark}") in scm.calls
+        assert not [call for call in scm.calls if call[0] == "inboxes"]
+        assert mirror.get("endpoints", "2")["hostname"] == "renamed"
+        assert len(mirror.query("endpoints")) == 6
+
+    def test_full_replaces_tables(self, mirror, scm):
+        mirror.sync()
+        scm.records["endpoints"] = scm.records["endpoints"][:2]
+        assert mirror.sync(full=True)["endpoints"] == 2
+        assert len(mirror.query("endpoints")) == 2
@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+from prelude_sdk.controllers.scm_controller import ScmController
+
+from testutils import StubAccount
+
+
+class TestScmPages:
+    def controller(self, total, cap=None):
+        controller = ScmController(StubAccount())
+        controller.requests = []
+        lock = threading.Lock()
+
+        def endpoints(top, skip, **kwargs):
+            with lock:
+                controller.requests.append((skip, top))
+            top = min(top, cap or top)
+            return dict(value=[dict(id=i) for i in range(total)][skip : skip + top])
+
+        controller.endpoints = endpoints
+        return controller
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    @pytest.mark.parametrize(
+        "total,cap", [(0, None), (5, None), (2500, None), (3000, None), (2500, 300)]
+    )
+    def test_all_records_in_order(self, total, cap, workers):
+        controller = self.controller(total, cap)
+        records = list(controller.iter_endpoints(page_size=1000, workers=workers))
+        assert [r["id"] for r in records] == list(range(total))
+
+    def test_stops_at_first_short_page(self):
+        controller = self.controller(2500)
+        list(controller.iter_endpoints(page_size=1000, workers=2))
+        skips = sorted(skip for skip, _ in controller.requests)
+        assert skips[:3] == [0, 1000, 2000]
+        assert skips[3:] in ([], [3000])
+
+    def test_cap_becomes_page_size(self):
+        controller = self.controller(1000, cap=300)
+        list(controller.iter_endpoints(page_size=1000, workers=2))
+        assert controller.requests[:2] == [(0, 1000), (300, 300)]
+        assert {top for _, top in controller.requests[1:]} == {300}
+
+    def test_short_listing_costs_one_probe(self):
+        controller = self.controller(5)
+        list(controller.iter_endpoints(page_size=1000, workers=4))
+        assert controller.requests == [(0, 1000), (5, 5)]
@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from prelude_sdk.controllers.http_controller import close_sessions, shared_session
+
+from testutils import StubAccount
+
+
+@pytest.fixture
+def server():
+    release = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            release.wait(5)
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/", release
+    release.set()
+    httpd.shutdown()
+    close_sessions()
+
+
+def watch_close(adapter):
+    closed = threading.Event()
+    close = adapter.close
+    adapter.close = lambda: (closed.set(), close())
+    return closed
+
+
+class TestSharedSession:
+    def test_same_session_per_account(self):
+        account = StubAccount()
+        assert shared_session(account) is shared_session(account, pool_maxsize=1)
+        assert shared_session(account) is not shared_session(StubAccount())
+
+    def test_growth_retires_idle_adapter(self, server):
+        url, release = server
+        release.set()
+        account = StubAccount()
+        session = shared_session(account)
+        session.get(url, timeout=5)
+        old = session.adapters["http://"]
+        closed = watch_close(old)
+
+        shared_session(account, pool_maxsize=64)
+        assert session.adapters["http://"] is not old
+        assert session.adapters["http://"]._pool_maxsize == 64
+        assert closed.is_set()
+
+    def test_growth_waits_for_in_flight_requests(self, server):
+        url, release = server
+        account = StubAccount()
+        session = shared_session(account)
+        old = session.adapters["http://"]
+        closed = watch_close(old)
+        request = threading.Thread(target=session.get, args=(url,))
+        request.start()
+        for _ in range(500):
+            if old._active:
+                break
+            time.sleep(0.01)
+
+        shared_session(account, pool_maxsize=64)
+        assert not closed.is_set()
+        release.set()
+        request.join(5)
+        assert closed.is_set()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    def test_forked_child_gets_its_own_session(self):
+        account = StubAccount()
+        parent = shared_session(account)
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write, str(shared_session(account) is not parent).encode())
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert os.read(read, 16) == b"True"
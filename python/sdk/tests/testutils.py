@@ -64,3 +64,59 @@ def check_dict_items(expected, actual):
         json.dumps(actual, sort_keys=True, default=str, cls=SortedListEncoder)
     )
     return _check_ordered_dict_items(expected, actual)
+
+
+class StubSession:
+    """Stands in for requests.Session: answers each request with the next scripted outcome"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        if isinstance(outcome, type) and issubclass(outcome, BaseException):
+            raise outcome()
+        return stub_response(*outcome) if isinstance(outcome, tuple) else outcome
+
+
+def stub_response(status=200, body=None, headers=None):
+    import requests
+
+    res = requests.Response()
+    res.status_code = status
+    res.headers.update(headers or {})
+    res._content = json.dumps(body if body is not None else {}).encode("utf-8")
+    res.request = requests.Request("GET", "https://api.test").prepare()
+    return res
+
+
+class StubAccount:
+    """The attributes HttpController reads from an account, without a keychain"""
+
+    def __init__(self, **kwargs):
+        self.account = f"stub-{uuid.uuid4()}"
+        self.hq = "https://api.test"
+        self.headers = dict(account=self.account, authorization="Bearer token")
+        self.token_location = None
+        self.resolve_enums = False
+        self.http_cache = None
+        self.memo_cache = None
+        self.rate_limiter = None
+        self.retry_policy = None
+        self.circuit_breaker = None
+        self.hooks = []
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+    def update_auth_header(self):
+        pass
+
+
+def stub_controller(controller_class, *outcomes, **account):
+    controller = controller_class(StubAccount(**account))
+    controller._session = StubSession(*outcomes)
+    return controller